@@ -258,7 +258,7 @@ class Config:
     @staticmethod
     def spam_model_path() -> Path:
         """Returns the path to the spam classifier model."""
-        return get_xdg_data_home() / "spam_model.json"
+        return get_xdg_data_home() / "spam_model.bin"
 
     @staticmethod
     def cache_dir() -> Path:
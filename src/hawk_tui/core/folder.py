@@ -62,6 +62,9 @@ class Folder:
         unread_count: Number of unread messages (for UI display).
 
         last_sync: Timestamp of the last successful sync operation.
+        highest_modseq: IMAP HIGHESTMODSEQ (RFC 7162 CONDSTORE) as of the
+                        last flag sync. Lets us ask the server for only the
+                        messages whose flags changed since then.
         id: Database primary key. None until saved to storage.
 
     Example:
@@ -93,6 +96,7 @@ class Folder:
 
     # Sync tracking
     last_sync: datetime | None = None
+    highest_modseq: int | None = None           # CONDSTORE mod-sequence
 
     # Database field
     id: int | None = None                       # Primary key (None until saved)
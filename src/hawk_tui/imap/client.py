@@ -22,10 +22,11 @@ import email.header
 import email.utils
 import logging
 import re
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
 from email.message import Message as EmailMessage
-from typing import TYPE_CHECKING, Any, Callable
+from typing import TYPE_CHECKING, Any
 
 import keyring
 from aioimaplib import aioimaplib
@@ -61,6 +62,33 @@ def _quote_folder_name(name: str) -> str:
     return name
 
 
+def _uid_sequence_set(uids: Iterable[int]) -> str:
+    """
+    Compress UIDs into an IMAP sequence set.
+
+    Consecutive runs are collapsed into ranges (RFC 2683 recommends
+    keeping command lines short), e.g. [1, 2, 3, 7, 9, 10] -> "1:3,7,9:10".
+
+    Args:
+        uids: UIDs to encode (any order, duplicates allowed).
+
+    Returns:
+        Sequence set string, or "" if there are no UIDs.
+    """
+    parts = []
+    start = end = None
+    for uid in sorted(set(uids)):
+        if end is not None and uid == end + 1:
+            end = uid
+            continue
+        if start is not None:
+            parts.append(f"{start}:{end}" if start != end else str(start))
+        start = end = uid
+    if start is not None:
+        parts.append(f"{start}:{end}" if start != end else str(start))
+    return ",".join(parts)
+
+
 @dataclass
 class ConnectionState:
     """
@@ -102,6 +130,10 @@ class IMAPClient:
     # Timeout for IMAP operations (seconds)
     TIMEOUT = 30
 
+    # FETCH data items - request only what each caller needs (RFC 4549)
+    ENVELOPE_ITEMS = "(UID FLAGS INTERNALDATE RFC822.SIZE ENVELOPE)"
+    BODY_ITEMS = "(UID FLAGS ENVELOPE BODY.PEEK[])"
+
     def __init__(self, account: "Account") -> None:
         """
         Initialize the IMAP client.
@@ -175,6 +207,13 @@ class IMAPClient:
             # Authenticate
             await self._authenticate()
 
+            # Turn on CONDSTORE so SELECT reports HIGHESTMODSEQ (RFC 7162)
+            if self.supports_condstore() and self._client.has_capability("ENABLE"):
+                try:
+                    await self._client.enable("CONDSTORE")
+                except Exception as e:
+                    logger.debug(f"ENABLE CONDSTORE failed: {e}")
+
             logger.info(f"Successfully connected to {self.account.imap_host}")
             return True
 
@@ -247,6 +286,12 @@ class IMAPClient:
         if not self.state.connected or not self._client:
             await self.connect()
 
+    def supports_condstore(self) -> bool:
+        """Check if server supports CONDSTORE (or QRESYNC, which implies it)."""
+        if not self._client:
+            return False
+        return self._client.has_capability("CONDSTORE") or self._client.has_capability("QRESYNC")
+
     def _parse_capabilities(self, response) -> list[str]:
         """Parse capabilities from CAPABILITY response."""
         capabilities = []
@@ -395,6 +440,7 @@ class IMAPClient:
                 "UNSEEN": status_response.get("UNSEEN", 0),
                 "UIDVALIDITY": status_response.get("UIDVALIDITY"),
                 "UIDNEXT": status_response.get("UIDNEXT"),
+                "HIGHESTMODSEQ": status_response.get("HIGHESTMODSEQ"),
             }
 
         logger.debug(f"Selecting folder: {folder_name}")
@@ -452,6 +498,11 @@ class IMAPClient:
             if match:
                 status["UNSEEN"] = int(match.group(1))
 
+            # Parse HIGHESTMODSEQ (CONDSTORE servers only)
+            match = re.search(r"HIGHESTMODSEQ\s+(\d+)", line, re.IGNORECASE)
+            if match:
+                status["HIGHESTMODSEQ"] = int(match.group(1))
+
         return status
 
     async def get_folder_status(self, folder_name: str) -> dict:
@@ -462,17 +513,19 @@ class IMAPClient:
             folder_name: Name of the folder.
 
         Returns:
-            Dictionary with MESSAGES, RECENT, UNSEEN, UIDNEXT, UIDVALIDITY.
+            Dictionary with MESSAGES, RECENT, UNSEEN, UIDNEXT, UIDVALIDITY
+            (and HIGHESTMODSEQ on CONDSTORE servers).
         """
         await self.ensure_connected()
 
         # Quote folder name for IMAP if it contains spaces or special chars
         quoted_name = _quote_folder_name(folder_name)
 
-        response = await self._client.status(
-            quoted_name,
-            "(MESSAGES RECENT UNSEEN UIDNEXT UIDVALIDITY)"
-        )
+        items = "MESSAGES RECENT UNSEEN UIDNEXT UIDVALIDITY"
+        if self.supports_condstore():
+            items += " HIGHESTMODSEQ"
+
+        response = await self._client.status(quoted_name, f"({items})")
 
         if response.result != "OK":
             return {}
@@ -513,47 +566,50 @@ class IMAPClient:
         Returns:
             Set of UIDs present on the server.
         """
-        import sys
+        return set(await self.search_uids(folder_name))
+
+    async def search_uids(self, folder_name: str, criteria: str = "ALL") -> list[int]:
+        """
+        Run UID SEARCH on a folder and return the matching UIDs.
+
+        The whole result comes back as a single untagged SEARCH line, which
+        is far cheaper than FETCH 1:* (UID) for large folders.
 
+        Args:
+            folder_name: Name of the folder.
+            criteria: IMAP search criteria (default "ALL").
+
+        Returns:
+            Sorted list of matching UIDs.
+        """
         await self.ensure_connected()
         status = await self.select_folder(folder_name)
 
         # Check if folder is empty
-        total = status.get("EXISTS", 0)
-        if total == 0:
-            return set()
+        if status.get("EXISTS", 0) == 0:
+            return []
 
-        # For large folders, aioimaplib's recursive response parser can hit
-        # Python's recursion limit. Temporarily increase it for this operation.
-        old_limit = sys.getrecursionlimit()
-        if total > 1000:
-            sys.setrecursionlimit(max(old_limit, total + 1000))
+        response = await self._client.uid_search(criteria, charset=None)
 
-        try:
-            # Fetch only UIDs for all messages (lightweight)
-            response = await self._client.fetch("1:*", "(UID)")
-
-            if response.result != "OK":
-                logger.error(f"UID fetch failed: {response.lines}")
-                return set()
-
-            # Parse UIDs from "N FETCH (UID xxx)" responses
-            uids = set()
-            uid_pattern = re.compile(r"UID\s+(\d+)")
-            for line in response.lines:
-                if isinstance(line, bytes):
-                    line = line.decode("utf-8", errors="replace")
-                match = uid_pattern.search(str(line))
-                if match:
-                    uids.add(int(match.group(1)))
-
-            logger.debug(f"Found {len(uids)} UIDs in {folder_name}")
-            return uids
-
-        finally:
-            # Restore original recursion limit
-            if total > 1000:
-                sys.setrecursionlimit(old_limit)
+        if response.result != "OK":
+            logger.error(f"UID SEARCH failed: {response.lines}")
+            return []
+
+        # Parse UIDs from the untagged SEARCH lines. aioimaplib strips the
+        # "SEARCH" keyword from them (older versions kept it, which the
+        # digit filter skips); the last line is the tagged status text.
+        uids: list[int] = []
+        for line in response.lines[:-1]:
+            if isinstance(line, (bytes, bytearray)):
+                line = line.decode("ascii", errors="replace")
+            uids.extend(int(part) for part in line.split() if part.isdigit())
+
+        # RFC 3501 does not require SEARCH results to be ordered, though
+        # servers return them ascending in practice; sorting presorted input
+        # is a single linear pass, so callers can rely on the order for free
+        uids.sort()
+        logger.debug(f"Found {len(uids)} UIDs in {folder_name}")
+        return uids
 
     async def fetch_messages(
         self,
@@ -589,10 +645,7 @@ class IMAPClient:
         # Build FETCH command items
         # We always fetch UID, envelope and flags
         # Body is optional and much slower
-        if fetch_body:
-            fetch_items = "(UID FLAGS ENVELOPE BODY.PEEK[])"
-        else:
-            fetch_items = "(UID FLAGS ENVELOPE BODY.PEEK[HEADER])"
+        fetch_items = self.BODY_ITEMS if fetch_body else self.ENVELOPE_ITEMS
 
         # Determine which messages to fetch
         # Note: UIDs can be sparse (deleted messages leave gaps), so for
@@ -600,7 +653,7 @@ class IMAPClient:
         use_uid_fetch = True
         if uids:
             # Specific UIDs requested - use UID FETCH
-            msg_range = ",".join(str(u) for u in uids)
+            msg_range = _uid_sequence_set(uids)
         elif since_uid:
             # Messages after a specific UID - use UID FETCH
             msg_range = f"{since_uid + 1}:*"
@@ -777,12 +830,41 @@ class IMAPClient:
 
         # Extract ENVELOPE (complex structure)
         # The envelope contains: date, subject, from, sender, reply-to, to, cc, bcc, in-reply-to, message-id
-        envelope_match = re.search(r"ENVELOPE\s*\((.+)\)", line, re.IGNORECASE)
+        envelope_match = re.search(r"ENVELOPE\s*\(", line, re.IGNORECASE)
         if envelope_match:
-            data["envelope"] = self._parse_envelope(envelope_match.group(1))
+            envelope_str = self._extract_parenthesized(line, envelope_match.end())
+            data["envelope"] = self._parse_envelope(envelope_str)
 
         return data if data else None
 
+    def _extract_parenthesized(self, line: str, start: int) -> str:
+        """
+        Return the text up to the parenthesis that closes the list opened
+        just before ``start``, honouring quoted strings.
+
+        Falls back to the rest of the line if the list is unterminated.
+        """
+        depth = 1
+        in_quote = False
+        i = start
+        while i < len(line):
+            char = line[i]
+            if in_quote:
+                if char == "\\":
+                    i += 1
+                elif char == '"':
+                    in_quote = False
+            elif char == '"':
+                in_quote = True
+            elif char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0:
+                    return line[start:i]
+            i += 1
+        return line[start:]
+
     def _parse_flags(self, flags_str: str) -> MessageFlags:
         """Convert IMAP flags string to MessageFlags."""
         result = MessageFlags.NONE
@@ -1089,6 +1171,78 @@ class IMAPClient:
             data=payload,
         )
 
+    async def fetch_envelopes(self, folder_name: str, uids: list[int]) -> list[Message]:
+        """
+        Fetch envelope data (no body) for specific messages.
+
+        Requests only UID, FLAGS, INTERNALDATE, RFC822.SIZE and ENVELOPE,
+        which is a small fraction of the full message size.
+
+        Args:
+            folder_name: Folder containing the messages.
+            uids: UIDs to fetch.
+
+        Returns:
+            List of Message objects with headers but empty bodies.
+        """
+        return await self._uid_fetch_messages(
+            folder_name, uids, self.ENVELOPE_ITEMS, include_body=False
+        )
+
+    async def fetch_bodies(self, folder_name: str, uids: list[int]) -> list[Message]:
+        """
+        Fetch complete messages (envelope plus full body) for specific UIDs.
+
+        Uses BODY.PEEK[] so fetching does not set the \\Seen flag.
+
+        Args:
+            folder_name: Folder containing the messages.
+            uids: UIDs to fetch.
+
+        Returns:
+            List of Message objects with bodies and attachments.
+        """
+        return await self._uid_fetch_messages(
+            folder_name, uids, self.BODY_ITEMS, include_body=True
+        )
+
+    async def _uid_fetch_messages(
+        self,
+        folder_name: str,
+        uids: list[int],
+        fetch_items: str,
+        *,
+        include_body: bool,
+    ) -> list[Message]:
+        """
+        Issue a UID FETCH for the given items and parse the result.
+
+        Args:
+            folder_name: Folder containing the messages.
+            uids: UIDs to fetch.
+            fetch_items: Parenthesized FETCH data items.
+            include_body: Whether to parse BODY[] literals into bodies.
+
+        Returns:
+            List of Message objects.
+        """
+        await self.ensure_connected()
+        status = await self.select_folder(folder_name)
+
+        if not uids or status.get("EXISTS", 0) == 0:
+            return []
+
+        uid_set = _uid_sequence_set(uids)
+        logger.debug(f"Fetching {fetch_items} for {len(uids)} messages from {folder_name}")
+
+        response = await self._client.uid("FETCH", uid_set, fetch_items)
+
+        if response.result != "OK":
+            logger.error(f"Fetch failed: {response.lines}")
+            return []
+
+        return self._parse_fetch_response(response, include_body)
+
     async def fetch_message_body(self, folder_name: str, uid: int) -> Message | None:
         """
         Fetch the full body of a specific message.
@@ -1100,13 +1254,94 @@ class IMAPClient:
         Returns:
             Message with full body, or None if not found.
         """
-        messages = await self.fetch_messages(
-            folder_name,
-            uids=[uid],
-            fetch_body=True
-        )
+        messages = await self.fetch_bodies(folder_name, [uid])
         return messages[0] if messages else None
 
+    async def fetch_flags(
+        self,
+        folder_name: str,
+        uids: list[int],
+    ) -> dict[int, MessageFlags]:
+        """
+        Fetch only the flags for specific messages.
+
+        Issues a single UID FETCH <set> (UID FLAGS) - no envelope or body -
+        so the response is tiny compared to fetch_messages(). UIDs missing
+        from the result no longer exist on the server (expunged).
+
+        Args:
+            folder_name: Folder containing the messages.
+            uids: UIDs to fetch flags for.
+
+        Returns:
+            Dictionary mapping UID to MessageFlags for messages that still exist.
+
+        Raises:
+            IMAPError: If the FETCH command fails.
+        """
+        await self.ensure_connected()
+        status = await self.select_folder(folder_name)
+
+        if not uids or status.get("EXISTS", 0) == 0:
+            return {}
+
+        uid_set = _uid_sequence_set(uids)
+        response = await self._client.uid("FETCH", uid_set, "(UID FLAGS)")
+
+        if response.result != "OK":
+            raise IMAPError(f"Flag fetch failed: {response.lines}")
+
+        flags: dict[int, MessageFlags] = {}
+        for line in response.lines:
+            data = self._parse_fetch_line(line)
+            if data and "uid" in data:
+                flags[data["uid"]] = data.get("flags", MessageFlags.NONE)
+
+        return flags
+
+    async def fetch_changed_flags(
+        self,
+        folder_name: str,
+        since_modseq: int,
+    ) -> dict[int, MessageFlags]:
+        """
+        Fetch flags only for messages changed since a mod-sequence.
+
+        Issues UID FETCH 1:* (UID FLAGS) (CHANGEDSINCE <modseq>) so the
+        response size is proportional to the number of changes, not the
+        size of the folder. Requires CONDSTORE (see supports_condstore()).
+
+        Args:
+            folder_name: Folder to check.
+            since_modseq: HIGHESTMODSEQ recorded at the previous sync.
+
+        Returns:
+            Dictionary mapping UID to MessageFlags for changed messages.
+
+        Raises:
+            IMAPError: If the FETCH command fails.
+        """
+        await self.ensure_connected()
+        status = await self.select_folder(folder_name)
+
+        if status.get("EXISTS", 0) == 0:
+            return {}
+
+        response = await self._client.uid(
+            "FETCH", "1:*", f"(UID FLAGS) (CHANGEDSINCE {since_modseq})"
+        )
+
+        if response.result != "OK":
+            raise IMAPError(f"CHANGEDSINCE fetch failed: {response.lines}")
+
+        flags: dict[int, MessageFlags] = {}
+        for line in response.lines:
+            data = self._parse_fetch_line(line)
+            if data and "uid" in data:
+                flags[data["uid"]] = data.get("flags", MessageFlags.NONE)
+
+        return flags
+
     # =========================================================================
     # Flag Operations
     # =========================================================================
@@ -1192,7 +1427,7 @@ class IMAPClient:
         batch_size = 100
         for i in range(0, len(uids), batch_size):
             batch = uids[i:i + batch_size]
-            uid_set = ",".join(str(u) for u in batch)
+            uid_set = _uid_sequence_set(batch)
 
             # Check if server supports MOVE
             if self._client.has_capability("MOVE"):
@@ -1209,8 +1444,10 @@ class IMAPClient:
                 if response.result != "OK":
                     raise IMAPError(f"Copy failed: {response.lines}")
 
-                # Mark as deleted
-                await self.set_flags(source_folder, batch, ["\\Deleted"], add=True)
+                # Mark as deleted (the source folder is still selected)
+                response = await self._client.uid("STORE", uid_set, "+FLAGS (\\Deleted)")
+                if response.result != "OK":
+                    raise IMAPError(f"Failed to set flags: {response.lines}")
 
                 # Expunge after each batch
                 await self._client.expunge()
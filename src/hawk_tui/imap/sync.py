@@ -9,6 +9,9 @@
 #   3. Flag sync: Update local flags from server, push local changes
 #   4. Deletion sync: Handle deleted messages
 #
+# Each folder issues a single UID SEARCH ALL whose result is shared by the
+# new-message, flag and deletion steps.
+#
 # Key concepts:
 #   - UIDVALIDITY: If this changes, all cached UIDs are invalid
 #   - HIGHESTMODSEQ: For CONDSTORE servers, enables efficient sync
@@ -18,15 +21,19 @@
 #   - Sync runs in background without blocking UI
 #   - Progress is reported via callbacks for UI updates
 #   - Sync can be cancelled mid-operation
+#   - During sync_all, message saves run on a background writer task so
+#     SQLite writes overlap the next IMAP fetch
 # =============================================================================
 
+import asyncio
 import logging
-from dataclasses import dataclass, field
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field, fields, replace
 from datetime import datetime
 from enum import Enum, auto
-from typing import Callable
 
-from hawk_tui.core import Account, Folder, FolderType, Message
+from hawk_tui.core import Account, Folder, FolderType, Message, MessageFlags
 from hawk_tui.imap.client import IMAPClient, IMAPAuthenticationError
 from hawk_tui.storage.repository import Repository
 from hawk_tui.spam import SpamClassifier
@@ -36,6 +43,108 @@ from hawk_tui.config import Config
 logger = logging.getLogger(__name__)
 
 
+# Spam classifier shared by all sync managers (see _load_spam_classifier)
+_shared_spam_classifier: SpamClassifier | None = None
+
+
+async def _load_spam_classifier(repo: Repository) -> SpamClassifier:
+    """
+    Load the saved spam model once per process.
+
+    Sync managers only read the classifier, so every sync shares the same
+    instance instead of reading the model from the database each time.
+    Falls back to a model file saved by older versions.
+
+    Args:
+        repo: Repository for the application database.
+    """
+    global _shared_spam_classifier
+
+    if _shared_spam_classifier is None:
+        classifier = SpamClassifier()
+        if not await classifier.load_from_db(repo):
+            classifier.load()
+        if classifier.is_trained:
+            logger.info(
+                f"Spam classifier loaded: {classifier.stats.spam_count} spam, "
+                f"{classifier.stats.ham_count} ham samples"
+            )
+        else:
+            logger.info("Spam classifier not yet trained - auto-filtering disabled until trained")
+        _shared_spam_classifier = classifier
+    return _shared_spam_classifier
+
+
+def refresh_spam_classifier() -> None:
+    """
+    Drop the cached spam classifier.
+
+    Call after saving new training data so the next sync reloads the model.
+    """
+    global _shared_spam_classifier
+
+    _shared_spam_classifier = None
+
+
+def _partition_messages(
+    messages: Sequence[Message],
+    scores: Sequence[float],
+    threshold: float,
+) -> tuple[list[Message], list[Message], list[int]]:
+    """
+    Split scored messages into ham and spam in a single traversal.
+
+    Args:
+        messages: Messages in fetch order.
+        scores: Spam score for each message, parallel to ``messages``.
+        threshold: Score at or above which a message is spam.
+
+    Returns:
+        Tuple of (ham messages, spam messages, spam UIDs).
+    """
+    ham: list[Message] = []
+    spam: list[Message] = []
+    spam_uids: list[int] = []
+    ham_append = ham.append
+    spam_append = spam.append
+    uid_append = spam_uids.append
+    for msg, score in zip(messages, scores, strict=True):
+        if score >= threshold:
+            spam_append(msg)
+            uid_append(msg.uid)
+            logger.info(
+                f"Spam detected (score={score:.2f}): {msg.subject[:50] if msg.subject else '(no subject)'}"
+            )
+        else:
+            ham_append(msg)
+    return ham, spam, spam_uids
+
+
+def _sorted_difference(a: Sequence[int], b: Sequence[int]) -> list[int]:
+    """
+    Return the items of sorted sequence ``a`` that are not in sorted ``b``.
+
+    A single linear merge over both inputs - no hash sets are built, so
+    large UID lists cost only their compact storage.
+
+    Args:
+        a: Ascending, duplicate-free UIDs.
+        b: Ascending, duplicate-free UIDs.
+
+    Returns:
+        Ascending list of UIDs in ``a`` but not in ``b``.
+    """
+    result: list[int] = []
+    j = 0
+    len_b = len(b)
+    for uid in a:
+        while j < len_b and b[j] < uid:
+            j += 1
+        if j == len_b or b[j] != uid:
+            result.append(uid)
+    return result
+
+
 class SyncStatus(Enum):
     """Current status of a sync operation."""
     IDLE = auto()           # Not syncing
@@ -47,12 +156,13 @@ class SyncStatus(Enum):
     CANCELLED = auto()      # Sync was cancelled
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SyncProgress:
     """
     Progress information for a sync operation.
 
-    Used to update the UI with sync status.
+    Used to update the UI with sync status. Instances are immutable
+    snapshots, so a callback can hold on to one without seeing it change.
 
     Attributes:
         status: Current sync status.
@@ -97,6 +207,9 @@ class SyncProgress:
 # Type alias for progress callbacks
 ProgressCallback = Callable[[SyncProgress], None]
 
+# Field names accepted by SyncManager._report_progress()
+_PROGRESS_FIELDS = frozenset(f.name for f in fields(SyncProgress))
+
 
 @dataclass
 class SyncResult:
@@ -144,6 +257,13 @@ class SyncManager:
     # Batch size for fetching messages (prevents memory issues)
     BATCH_SIZE = 50
 
+    # Batch size for FLAGS-only fetches (responses are a few bytes per message)
+    FLAG_BATCH_SIZE = 500
+
+    # Fetched batches that may wait for the background writer before the
+    # fetch loop blocks (bounds memory held by unsaved messages)
+    WRITE_QUEUE_SIZE = 4
+
     def __init__(
         self,
         client: IMAPClient,
@@ -164,19 +284,14 @@ class SyncManager:
         self._cancelled = False
         self._progress = SyncProgress()
 
-        # Load spam classifier and config
+        # Background writer (only running during sync_all)
+        self._write_queue: asyncio.Queue[list[Message] | None] | None = None
+        self._writer_task: asyncio.Task[None] | None = None
+        self._write_error: Exception | None = None
+
+        # Load spam config; the classifier is loaded on first use
         self._spam_classifier: SpamClassifier | None = None
         self._spam_config = self._load_spam_config()
-        if self._spam_config["enabled"]:
-            self._spam_classifier = SpamClassifier()
-            self._spam_classifier.load()
-            if self._spam_classifier.is_trained:
-                logger.info(
-                    f"Spam classifier loaded: {self._spam_classifier.stats.spam_count} spam, "
-                    f"{self._spam_classifier.stats.ham_count} ham samples"
-                )
-            else:
-                logger.info("Spam classifier not yet trained - auto-filtering disabled until trained")
 
     def _load_spam_config(self) -> dict:
         """Load spam configuration settings."""
@@ -213,7 +328,7 @@ class SyncManager:
             Tuple of (non-spam messages to keep, count of spam moved).
         """
         # Skip if spam filtering not enabled/configured
-        if not self._spam_classifier or not self._spam_classifier.is_trained:
+        if not self._spam_config["enabled"]:
             return messages, 0
 
         if not self._spam_config["auto_move_to_junk"]:
@@ -227,6 +342,11 @@ class SyncManager:
         if source_folder.folder_type == FolderType.TRASH:
             return messages, 0
 
+        if self._spam_classifier is None:
+            self._spam_classifier = await _load_spam_classifier(self.repo)
+        if not self._spam_classifier.is_trained:
+            return messages, 0
+
         # Find the Junk folder for this account
         junk_folder = await self.repo.get_folder_by_type(
             self.account.id, FolderType.JUNK
@@ -236,47 +356,107 @@ class SyncManager:
             return messages, 0
 
         threshold = self._spam_config["threshold"]
-        spam_messages: list[Message] = []
-        ham_messages: list[Message] = []
 
-        # Classify each message
-        for msg in messages:
-            score = self._spam_classifier.classify(msg)
-            if score >= threshold:
-                logger.info(
-                    f"Spam detected (score={score:.2f}): {msg.subject[:50] if msg.subject else '(no subject)'}"
-                )
-                spam_messages.append(msg)
-                msg.mark_spam()  # Set the spam flag
-            else:
-                ham_messages.append(msg)
+        # Score and partition in one pass. Messages are not mutated until
+        # the IMAP move has succeeded.
+        scores = self._spam_classifier.classify_batch(messages)
+        ham_messages, spam_messages, spam_uids = _partition_messages(
+            messages, scores, threshold
+        )
+        if not spam_messages:
+            return messages, 0
 
         # Move spam messages to Junk folder via IMAP
-        if spam_messages:
-            spam_uids = [msg.uid for msg in spam_messages if msg.uid]
-            if spam_uids:
-                try:
-                    await self.client.move_messages(
-                        source_folder.name,
-                        junk_folder.name,
-                        spam_uids,
-                    )
-                    logger.info(
-                        f"Moved {len(spam_uids)} spam messages to {junk_folder.name}"
-                    )
-
-                    # Update folder_id for moved messages so they're saved correctly
-                    for msg in spam_messages:
-                        msg.folder_id = junk_folder.id
+        try:
+            await self.client.move_messages(
+                source_folder.name,
+                junk_folder.name,
+                spam_uids,
+            )
+            logger.info(
+                f"Moved {len(spam_messages)} spam messages to {junk_folder.name}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to move spam to Junk: {e}")
+            # On failure, keep every message in the original folder untouched
+            return messages, 0
 
-                except Exception as e:
-                    logger.error(f"Failed to move spam to Junk: {e}")
-                    # On failure, keep messages in original folder
-                    ham_messages.extend(spam_messages)
-                    return ham_messages, 0
+        # Move succeeded - flag spam and update folder_id so they're saved correctly
+        junk_id = junk_folder.id
+        for msg in spam_messages:
+            msg.mark_spam()
+            msg.folder_id = junk_id
 
         return ham_messages, len(spam_messages)
 
+    # -------------------------------------------------------------------------
+    # Background message writer
+    # -------------------------------------------------------------------------
+
+    def _start_writer(self) -> None:
+        """Start the background task that saves fetched message batches."""
+        self._write_queue = asyncio.Queue(maxsize=self.WRITE_QUEUE_SIZE)
+        self._write_error = None
+        self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def _stop_writer(self) -> None:
+        """Save any queued batches and stop the background writer."""
+        if self._writer_task is None or self._write_queue is None:
+            return
+        await self._write_queue.put(None)
+        await self._writer_task
+        self._writer_task = None
+        self._write_queue = None
+
+    async def _writer_loop(self) -> None:
+        """
+        Consume message batches from the write queue until a None sentinel.
+
+        After a failed save, later batches are discarded; the error is
+        re-raised to the sync loop by _flush_writes().
+        """
+        queue = self._write_queue
+        if queue is None:
+            return
+        while (messages := await queue.get()) is not None:
+            try:
+                if self._write_error is None:
+                    await self.repo.save_messages_bulk(messages)
+            except Exception as e:
+                logger.error(f"Failed to save {len(messages)} messages: {e}")
+                self._write_error = e
+            finally:
+                queue.task_done()
+        queue.task_done()
+
+    async def _save_messages(self, messages: list[Message]) -> None:
+        """
+        Save a batch of fetched messages.
+
+        Hands the batch to the background writer when one is running, so the
+        caller can start the next IMAP fetch right away. Otherwise saves inline.
+
+        Args:
+            messages: Messages to persist.
+        """
+        if self._write_queue is None:
+            await self.repo.save_messages_bulk(messages)
+        else:
+            await self._write_queue.put(messages)
+
+    async def _flush_writes(self) -> None:
+        """
+        Wait until every queued batch has been saved.
+
+        Raises:
+            Exception: The first error the background writer hit, if any.
+        """
+        if self._write_queue is not None:
+            await self._write_queue.join()
+        if self._write_error is not None:
+            error, self._write_error = self._write_error, None
+            raise error
+
     def _report_progress(
         self,
         callback: ProgressCallback | None,
@@ -289,9 +469,8 @@ class SyncManager:
             callback: Optional callback to notify.
             **updates: Fields to update in progress.
         """
-        for key, value in updates.items():
-            if hasattr(self._progress, key):
-                setattr(self._progress, key, value)
+        valid_updates = {k: v for k, v in updates.items() if k in _PROGRESS_FIELDS}
+        self._progress = replace(self._progress, **valid_updates)
 
         if callback:
             callback(self._progress)
@@ -316,7 +495,7 @@ class SyncManager:
         Returns:
             SyncResult indicating success/failure and statistics.
         """
-        start_time = datetime.now()
+        start_time = time.monotonic()
         result = SyncResult()
         self._cancelled = False
         self._progress = SyncProgress(
@@ -351,6 +530,9 @@ class SyncManager:
             # Sync folder metadata to database
             await self._sync_folders(server_folders)
 
+            # Save fetched batches in the background while the next one downloads
+            self._start_writer()
+
             # Get folders to sync
             db_folders = await self.repo.get_folders(self.account.id)
             self._report_progress(
@@ -421,8 +603,10 @@ class SyncManager:
                 status=SyncStatus.ERROR,
                 error=error_msg,
             )
+        finally:
+            await self._stop_writer()
 
-        result.duration_seconds = (datetime.now() - start_time).total_seconds()
+        result.duration_seconds = time.monotonic() - start_time
         return result
 
     async def _sync_folders(self, server_folders: list[Folder]) -> None:
@@ -439,28 +623,30 @@ class SyncManager:
         local_by_name = {f.name: f for f in local_folders}
         server_names = {f.name for f in server_folders}
 
-        # Update or create folders
-        for server_folder in server_folders:
-            local_folder = local_by_name.get(server_folder.name)
-
-            if local_folder:
-                # Update existing folder
-                local_folder.folder_type = server_folder.folder_type
-                local_folder.delimiter = server_folder.delimiter
-                local_folder.total_messages = server_folder.total_messages
-                local_folder.unread_count = server_folder.unread_count
-                # Don't update uidvalidity here - that's checked during message sync
-                await self.repo.save_folder(local_folder)
-            else:
-                # Create new folder
-                server_folder.account_id = self.account.id
-                await self.repo.save_folder(server_folder)
-
-        # Remove folders that no longer exist on server
-        for local_folder in local_folders:
-            if local_folder.name not in server_names:
-                logger.info(f"Removing deleted folder: {local_folder.name}")
-                await self.repo.delete_folder(local_folder.id)
+        # Write all folder changes in one transaction (one commit, not N)
+        async with self.repo.transaction():
+            # Update or create folders
+            for server_folder in server_folders:
+                local_folder = local_by_name.get(server_folder.name)
+
+                if local_folder:
+                    # Update existing folder
+                    local_folder.folder_type = server_folder.folder_type
+                    local_folder.delimiter = server_folder.delimiter
+                    local_folder.total_messages = server_folder.total_messages
+                    local_folder.unread_count = server_folder.unread_count
+                    # Don't update uidvalidity here - that's checked during message sync
+                    await self.repo.save_folder(local_folder)
+                else:
+                    # Create new folder
+                    server_folder.account_id = self.account.id
+                    await self.repo.save_folder(server_folder)
+
+            # Remove folders that no longer exist on server
+            for local_folder in local_folders:
+                if local_folder.name not in server_names:
+                    logger.info(f"Removing deleted folder: {local_folder.name}")
+                    await self.repo.delete_folder(local_folder.id)
 
     async def sync_folder(
         self,
@@ -494,6 +680,7 @@ class SyncManager:
             status = await self.client.select_folder(folder.name)
             server_uidvalidity = status.get("UIDVALIDITY")
             server_exists = status.get("EXISTS", 0)
+            server_modseq = status.get("HIGHESTMODSEQ")
 
             self._report_progress(
                 progress_callback,
@@ -505,7 +692,13 @@ class SyncManager:
                 folder, server_uidvalidity
             )
 
+            # One UID SEARCH per folder, shared by every step below
+            server_uids = await self.client.search_uids(folder.name)
+
             if uidvalidity_changed:
+                # Mod-sequences from the old UIDVALIDITY epoch are meaningless
+                folder.highest_modseq = None
+
                 # UIDVALIDITY changed - need full resync
                 logger.warning(
                     f"UIDVALIDITY changed for {folder.name}: "
@@ -514,31 +707,57 @@ class SyncManager:
                 result = await self._full_folder_sync(
                     folder,
                     server_uidvalidity,
+                    server_uids=server_uids,
                     progress_callback=progress_callback,
                 )
             else:
                 # Incremental sync
                 result = await self._incremental_sync(
                     folder,
+                    server_uids=server_uids,
                     progress_callback=progress_callback,
                 )
 
-            # Sync flags if requested
-            if sync_flags and not self._cancelled:
-                flags_result = await self._sync_flags(folder)
-                result.updated_messages += flags_result
+            # New messages must be on disk before local state is compared
+            await self._flush_writes()
 
-            # Sync deletions if requested
-            if sync_deletions and not self._cancelled:
-                deleted = await self._sync_deletions(folder)
-                result.deleted_messages += deleted
+            # Collect flag changes and deletions in a single FLAGS-only pass
+            local_flags: dict[int, MessageFlags] = {}
+            flag_updates: dict[int, MessageFlags] = {}
+            deleted_uids: list[int] = []
+            if (sync_flags or sync_deletions) and not self._cancelled:
+                local_flags = await self.repo.get_local_flags(folder.id)
+                flag_updates, deleted_uids = await self._collect_flag_changes(
+                    folder,
+                    local_flags,
+                    server_uids,
+                    server_modseq=server_modseq,
+                    sync_flags=sync_flags,
+                )
 
-            # Update folder metadata
-            folder.total_messages = await self.repo.get_message_count(folder.id)
-            folder.unread_count = await self.repo.get_unread_count(folder.id)
-            folder.last_sync = datetime.now()
-            folder.uidvalidity = server_uidvalidity
-            await self.repo.save_folder(folder)
+            # Apply them together with the folder metadata in one commit.
+            # The block holds the repository's write lock, so UI writes wait
+            # for it: keep IMAP round trips and callbacks out of it.
+            async with self.repo.transaction():
+                if flag_updates:
+                    await self.repo.update_flags_bulk(folder.id, flag_updates)
+                    result.updated_messages += len(flag_updates)
+                    logger.debug(
+                        f"Updated flags for {len(flag_updates)} messages "
+                        f"in {folder.name}"
+                    )
+
+                if sync_deletions and local_flags and not self._cancelled:
+                    result.deleted_messages += await self._sync_deletions(
+                        folder, deleted_uids, len(local_flags), len(server_uids)
+                    )
+
+                # Update folder metadata
+                folder.total_messages = await self.repo.get_message_count(folder.id)
+                folder.unread_count = await self.repo.get_unread_count(folder.id)
+                folder.last_sync = datetime.now()
+                folder.uidvalidity = server_uidvalidity
+                await self.repo.save_folder(folder)
 
         except Exception as e:
             error_msg = f"Error syncing folder {folder.name}: {e}"
@@ -546,6 +765,15 @@ class SyncManager:
             result.success = False
             result.errors.append(error_msg)
 
+            # Settle this folder's queued batches here, so a failed save
+            # can't discard the next folder's batches or fail its sync
+            try:
+                await self._flush_writes()
+            except Exception as e:
+                error_msg = f"Error saving messages for {folder.name}: {e}"
+                logger.error(error_msg)
+                result.errors.append(error_msg)
+
         return result
 
     async def _check_uidvalidity(
@@ -582,6 +810,7 @@ class SyncManager:
         folder: Folder,
         server_uidvalidity: int | None,
         *,
+        server_uids: list[int],
         progress_callback: ProgressCallback | None = None,
     ) -> SyncResult:
         """
@@ -593,6 +822,7 @@ class SyncManager:
         Args:
             folder: Folder to sync.
             server_uidvalidity: New UIDVALIDITY value.
+            server_uids: All UIDs currently on the server, ascending.
             progress_callback: Progress callback.
 
         Returns:
@@ -606,8 +836,8 @@ class SyncManager:
         deleted = await self.repo.delete_all_messages_in_folder(folder.id)
         logger.debug(f"Cleared {deleted} existing messages from {folder.name}")
 
-        # Get all UIDs from server
-        all_uids = sorted(await self.client.get_folder_uids(folder.name))
+        # search_uids() already returns UIDs ascending - batch over it directly
+        all_uids = server_uids
         total_messages = len(all_uids)
 
         if total_messages == 0:
@@ -619,30 +849,27 @@ class SyncManager:
 
         # Fetch messages in batches
         fetched_count = 0
+        total_batches = (total_messages + self.BATCH_SIZE - 1) // self.BATCH_SIZE
+        debug = logger.isEnabledFor(logging.DEBUG)
         for i in range(0, total_messages, self.BATCH_SIZE):
             if self._cancelled:
                 break
 
             batch_uids = all_uids[i:i + self.BATCH_SIZE]
-            batch_num = (i // self.BATCH_SIZE) + 1
-            total_batches = (total_messages + self.BATCH_SIZE - 1) // self.BATCH_SIZE
-
-            logger.debug(
-                f"Fetching batch {batch_num}/{total_batches} "
-                f"({len(batch_uids)} messages) from {folder.name}"
-            )
+            if debug:
+                logger.debug(
+                    f"Fetching batch {(i // self.BATCH_SIZE) + 1}/{total_batches} "
+                    f"({len(batch_uids)} messages) from {folder.name}"
+                )
 
             # Report progress before fetching
-            self._report_progress(
-                progress_callback,
-                folder=f"{folder.name} ({fetched_count}/{total_messages})",
-            )
+            if progress_callback is not None:
+                self._report_progress(
+                    progress_callback,
+                    folder=f"{folder.name} ({fetched_count}/{total_messages})",
+                )
 
-            messages = await self.client.fetch_messages(
-                folder.name,
-                uids=batch_uids,
-                fetch_body=True,
-            )
+            messages = await self.client.fetch_bodies(folder.name, batch_uids)
 
             if messages:
                 # Prepare messages for storage
@@ -656,17 +883,18 @@ class SyncManager:
                 result.spam_moved += spam_count
 
                 # Save messages to database
-                await self.repo.save_messages_bulk(ham_messages)
+                await self._save_messages(ham_messages)
 
                 fetched_count += len(messages)
                 result.new_messages += len(messages)
 
-                self._report_progress(
-                    progress_callback,
-                    synced_messages=fetched_count,
-                    new_messages=self._progress.new_messages + fetched_count,
-                    folder=f"{folder.name} ({fetched_count}/{total_messages})",
-                )
+                if progress_callback is not None:
+                    self._report_progress(
+                        progress_callback,
+                        synced_messages=fetched_count,
+                        new_messages=self._progress.new_messages + len(messages),
+                        folder=f"{folder.name} ({fetched_count}/{total_messages})",
+                    )
 
         # Update folder's UIDVALIDITY
         folder.uidvalidity = server_uidvalidity
@@ -684,6 +912,7 @@ class SyncManager:
         self,
         folder: Folder,
         *,
+        server_uids: list[int],
         progress_callback: ProgressCallback | None = None,
     ) -> SyncResult:
         """
@@ -697,6 +926,7 @@ class SyncManager:
 
         Args:
             folder: Folder to sync.
+            server_uids: All UIDs currently on the server.
             progress_callback: Progress callback.
 
         Returns:
@@ -704,12 +934,10 @@ class SyncManager:
         """
         result = SyncResult()
 
-        # Get all UIDs from server and locally
-        server_uids = await self.client.get_folder_uids(folder.name)
-        local_uids = await self.repo.get_local_uids(folder.id)
+        local_uids = await self.repo.get_local_uids_sorted(folder.id)
 
-        # Find UIDs on server that we don't have locally
-        missing_uids = sorted(server_uids - local_uids)  # Sort for consistent ordering
+        # Find UIDs on server that we don't have locally (both lists are sorted)
+        missing_uids = _sorted_difference(server_uids, local_uids)
         total_missing = len(missing_uids)
 
         logger.debug(
@@ -723,30 +951,27 @@ class SyncManager:
 
         # Fetch missing messages in batches
         fetched_count = 0
+        total_batches = (total_missing + self.BATCH_SIZE - 1) // self.BATCH_SIZE
+        debug = logger.isEnabledFor(logging.DEBUG)
         for i in range(0, total_missing, self.BATCH_SIZE):
             if self._cancelled:
                 break
 
             batch_uids = missing_uids[i:i + self.BATCH_SIZE]
-            batch_num = (i // self.BATCH_SIZE) + 1
-            total_batches = (total_missing + self.BATCH_SIZE - 1) // self.BATCH_SIZE
-
-            logger.debug(
-                f"Fetching batch {batch_num}/{total_batches} "
-                f"({len(batch_uids)} messages) from {folder.name}"
-            )
+            if debug:
+                logger.debug(
+                    f"Fetching batch {(i // self.BATCH_SIZE) + 1}/{total_batches} "
+                    f"({len(batch_uids)} messages) from {folder.name}"
+                )
 
             # Report progress before fetching
-            self._report_progress(
-                progress_callback,
-                folder=f"{folder.name} ({fetched_count}/{total_missing})",
-            )
+            if progress_callback is not None:
+                self._report_progress(
+                    progress_callback,
+                    folder=f"{folder.name} ({fetched_count}/{total_missing})",
+                )
 
-            messages = await self.client.fetch_messages(
-                folder.name,
-                uids=batch_uids,
-                fetch_body=True,
-            )
+            messages = await self.client.fetch_bodies(folder.name, batch_uids)
 
             if messages:
                 # Prepare messages for storage
@@ -768,18 +993,20 @@ class SyncManager:
 
                 # Save messages to database
                 if ham_messages:
-                    await self.repo.save_messages_bulk(ham_messages)
-                    logger.debug(f"Saved {len(ham_messages)} messages to {folder.name}")
+                    await self._save_messages(ham_messages)
+                    if debug:
+                        logger.debug(f"Queued {len(ham_messages)} messages for {folder.name}")
 
                 fetched_count += len(messages)
                 result.new_messages += len(messages)
 
-                self._report_progress(
-                    progress_callback,
-                    synced_messages=fetched_count,
-                    new_messages=self._progress.new_messages + fetched_count,
-                    folder=f"{folder.name} ({fetched_count}/{total_missing})",
-                )
+                if progress_callback is not None:
+                    self._report_progress(
+                        progress_callback,
+                        synced_messages=fetched_count,
+                        new_messages=self._progress.new_messages + len(messages),
+                        folder=f"{folder.name} ({fetched_count}/{total_missing})",
+                    )
 
         if result.spam_moved > 0:
             logger.info(
@@ -791,89 +1018,163 @@ class SyncManager:
 
         return result
 
-    async def _sync_flags(self, folder: Folder) -> int:
+    async def _collect_flag_changes(
+        self,
+        folder: Folder,
+        local_flags: dict[int, MessageFlags],
+        server_uids: list[int],
+        *,
+        server_modseq: int | None = None,
+        sync_flags: bool = True,
+    ) -> tuple[dict[int, MessageFlags], list[int]]:
         """
-        Synchronize message flags between server and local.
+        Find flag changes and server-side deletions, without writing them.
 
-        Currently this is one-way: server -> local.
+        Deletions come straight from a sorted merge of cached UIDs against
+        the folder's UID SEARCH result. On CONDSTORE servers with a stored
+        HIGHESTMODSEQ, only messages changed since then are fetched;
+        otherwise flags are fetched (FLAGS only) for every cached UID still
+        on the server.
+
+        Flag sync is currently one-way: server -> local.
         TODO: Implement bidirectional sync for local flag changes.
 
         Args:
-            folder: Folder to sync flags for.
+            folder: Folder to sync.
+            local_flags: Local UID -> flags mapping for the folder.
+            server_uids: All UIDs currently on the server (ascending).
+            server_modseq: HIGHESTMODSEQ reported by SELECT, if any.
+            sync_flags: If True, fetch flag changes from the server.
 
         Returns:
-            Number of messages with updated flags.
+            Tuple of (UID -> new flags for changed messages, cached UIDs
+            no longer on the server).
         """
-        updated_count = 0
+        if not local_flags:
+            if sync_flags:
+                folder.highest_modseq = server_modseq
+            return {}, []
+
+        # Both sides are in ascending UID order, so one merge finds deletions
+        deleted_uids = _sorted_difference(list(local_flags), server_uids)
+
+        updates: dict[int, MessageFlags] = {}
+        if sync_flags:
+            use_condstore = (
+                folder.highest_modseq is not None
+                and server_modseq is not None
+                and self.client.supports_condstore()
+            )
+            if use_condstore:
+                updates = await self._changed_flags(folder, local_flags, server_modseq)
+            else:
+                updates = await self._all_flags(folder, local_flags, deleted_uids)
 
-        # Get local UID -> flags mapping
-        local_flags = await self.repo.get_local_flags(folder.id)
+            if not self._cancelled:
+                folder.highest_modseq = server_modseq
 
-        if not local_flags:
-            return 0
+        return updates, deleted_uids
 
-        # Fetch current flags from server for these UIDs
-        uids = list(local_flags.keys())
+    async def _changed_flags(
+        self,
+        folder: Folder,
+        local_flags: dict[int, MessageFlags],
+        server_modseq: int,
+    ) -> dict[int, MessageFlags]:
+        """
+        Collect flag changes via CONDSTORE (CHANGEDSINCE).
 
-        # Fetch flags in batches to avoid huge responses
-        updates: dict[int, any] = {}
-        for i in range(0, len(uids), self.BATCH_SIZE):
-            batch_uids = uids[i:i + self.BATCH_SIZE]
-            server_messages = await self.client.fetch_messages(
-                folder.name,
-                uids=batch_uids,
-            )
+        Args:
+            folder: Folder with a stored highest_modseq.
+            local_flags: Local UID -> flags mapping.
+            server_modseq: Current HIGHESTMODSEQ on the server.
 
-            # Compare and collect updates
-            for msg in server_messages:
-                local_msg_flags = local_flags.get(msg.uid)
-                if local_msg_flags is not None and local_msg_flags != msg.flags:
-                    updates[msg.uid] = msg.flags
+        Returns:
+            UID -> new flags for cached messages whose flags differ.
+        """
+        if server_modseq == folder.highest_modseq:
+            # Nothing in the folder has changed since the last sync
+            return {}
+
+        changed = await self.client.fetch_changed_flags(folder.name, folder.highest_modseq)
+        return {
+            uid: flags
+            for uid, flags in changed.items()
+            if uid in local_flags and local_flags[uid] != flags
+        }
+
+    async def _all_flags(
+        self,
+        folder: Folder,
+        local_flags: dict[int, MessageFlags],
+        deleted_uids: list[int],
+    ) -> dict[int, MessageFlags]:
+        """
+        Collect flag changes by fetching FLAGS for every cached UID.
+
+        Args:
+            folder: Folder to check.
+            local_flags: Local UID -> flags mapping (ascending UIDs).
+            deleted_uids: Cached UIDs already known to be gone from the server.
+
+        Returns:
+            UID -> new flags for cached messages whose flags differ.
+        """
+        # Only fetch flags for cached UIDs still on the server
+        if deleted_uids:
+            gone = set(deleted_uids)
+            uids = [uid for uid in local_flags if uid not in gone]
+        else:
+            uids = list(local_flags)
+
+        # Fetch flags in batches to keep command lines and responses small
+        updates: dict[int, MessageFlags] = {}
+        for i in range(0, len(uids), self.FLAG_BATCH_SIZE):
+            if self._cancelled:
+                break
+            batch_uids = uids[i:i + self.FLAG_BATCH_SIZE]
+            server_flags = await self.client.fetch_flags(folder.name, batch_uids)
 
-        # Apply flag updates
-        if updates:
-            await self.repo.update_flags_bulk(folder.id, updates)
-            updated_count = len(updates)
-            logger.debug(f"Updated flags for {updated_count} messages in {folder.name}")
+            # Compare and collect updates
+            for uid, flags in server_flags.items():
+                if local_flags.get(uid, flags) != flags:
+                    updates[uid] = flags
 
-        return updated_count
+        return updates
 
-    async def _sync_deletions(self, folder: Folder) -> int:
+    async def _sync_deletions(
+        self,
+        folder: Folder,
+        deleted_uids: list[int],
+        local_count: int,
+        server_count: int,
+    ) -> int:
         """
         Remove locally cached messages that were deleted on server.
 
         Args:
             folder: Folder to check for deletions.
+            deleted_uids: Cached UIDs that are no longer on the server.
+            local_count: Number of UIDs cached locally.
+            server_count: Number of UIDs on the server.
 
         Returns:
             Number of messages deleted locally.
         """
-        # Get local UIDs
-        local_uids = await self.repo.get_local_uids(folder.id)
-
-        if not local_uids:
-            return 0
-
-        # Get server UIDs directly (more reliable than fetching full messages)
-        server_uids = await self.client.get_folder_uids(folder.name)
-
         # Safeguard: If server returns no UIDs but we have local messages,
         # something is wrong - don't delete anything
-        if not server_uids and local_uids:
+        if server_count == 0:
             logger.warning(
                 f"Server returned 0 UIDs for {folder.name} but we have "
-                f"{len(local_uids)} local messages - skipping deletion sync"
+                f"{local_count} local messages - skipping deletion sync"
             )
             return 0
 
-        # Find UIDs that exist locally but not on server
-        deleted_uids = local_uids - server_uids
-
         # Safeguard: Don't delete more than 50% of messages in one sync
         # This prevents catastrophic data loss from sync bugs
-        if len(deleted_uids) > len(local_uids) * 0.5:
+        if len(deleted_uids) > local_count * 0.5:
             logger.warning(
-                f"Deletion sync would remove {len(deleted_uids)}/{len(local_uids)} "
+                f"Deletion sync would remove {len(deleted_uids)}/{local_count} "
                 f"messages from {folder.name} - skipping as safety measure"
             )
             return 0
@@ -7,24 +7,31 @@
 # emails that break text-based rendering.
 #
 # Process:
-#   1. Start headless Chromium via Playwright
-#   2. Load HTML email content
+#   1. Start headless Chromium via Playwright (once per process, shared)
+#   2. Lease a pre-warmed page from the pool and load HTML email content
 #   3. Wait for rendering (images, fonts, etc.)
 #   4. Screenshot the rendered page
-#   5. Convert screenshot to terminal graphics (Sixel/Kitty)
+#   5. Blank the page and return it to the pool
+#   6. Convert screenshot to terminal graphics (Sixel/Kitty)
 #
 # Requires: pip install playwright && playwright install chromium
 # =============================================================================
 
+import asyncio
+import functools
+import os
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 
 if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright, Route
+
     from hawk_tui.rendering.images import ImageDimensions
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BrowserRenderOptions:
     """
     Options for browser-based rendering.
@@ -33,14 +40,25 @@ class BrowserRenderOptions:
         viewport_width: Browser viewport width in pixels.
         viewport_height: Browser viewport height in pixels.
         wait_timeout: Max time to wait for page load (ms).
+        image_timeout: Max time to wait for images after the DOM is ready (ms).
         dark_mode: Use dark background (better for terminals).
         inject_css: Additional CSS to inject.
+        screenshot_format: "png" for lossless output that Kitty can display
+                           as-is, or "jpeg" for much smaller screenshots
+                           when the image is downscaled or re-encoded anyway.
+        screenshot_quality: JPEG quality (1-100), ignored for PNG.
+        block_images: Don't fetch remote images (embedded data: URIs still
+                      render). Avoids waiting on slow hosts and tracking pixels.
     """
     viewport_width: int = 600      # Good width for email content
     viewport_height: int = 800
     wait_timeout: int = 10000
+    image_timeout: int = 2000
     dark_mode: bool = True         # Match terminal theme
     inject_css: str = ""
+    screenshot_format: Literal["png", "jpeg"] = "png"
+    screenshot_quality: int = 85
+    block_images: bool = True
 
 
 # Default CSS for email rendering with dark mode
@@ -75,6 +93,63 @@ pre, code {
 """
 
 
+# Prepares a loaded email for its screenshot in a single round trip: waits
+# until every <img> has loaded or failed (or `timeout` ms pass) and returns
+# the document height. Emails are static documents, so images are the only
+# thing worth waiting for once the DOM is parsed.
+PREPARE_PAGE_JS = """
+async (timeout) => {
+    await Promise.race([
+        Promise.all(Array.from(document.images).map(img => img.complete ? null :
+            new Promise(res => {
+                img.addEventListener('load', res);
+                img.addEventListener('error', res);
+            }))),
+        new Promise(res => setTimeout(res, timeout)),
+    ]);
+    return (document.body || document.documentElement).scrollHeight;
+}
+"""
+
+# Chromium switches for a headless, single-purpose screenshot browser:
+# everything a user-facing browser runs in the background is turned off
+CHROMIUM_ARGS = (
+    "--disable-gpu",
+    "--disable-software-rasterizer",
+    "--disable-dev-shm-usage",
+    "--disable-features=IsolateOrigins,site-per-process,"
+    "MojoVideoCapture,SurfaceSynchronization",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-translate",
+    "--disable-sync",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--mute-audio",
+    "--hide-scrollbars",
+)
+
+# Request types never worth fetching for a static email screenshot
+BLOCKED_RESOURCE_TYPES = frozenset({"font", "media", "websocket", "manifest"})
+
+
+@functools.lru_cache(maxsize=8)
+def _style_tag(options: BrowserRenderOptions) -> str:
+    """
+    Build the <style> tag appended to an email for the given options.
+
+    The tag is appended to the email's HTML, so the styles arrive with the
+    document: no extra round trip, and no reflow after parsing. (An init
+    script would not survive set_content(), which rewrites the document
+    with document.write.)
+    """
+    css = (DARK_MODE_CSS if options.dark_mode else "") + options.inject_css
+    return f"<style>{css}</style>" if css else ""
+
+
 class BrowserRenderer:
     """
     Renders HTML emails using a headless browser.
@@ -82,25 +157,48 @@ class BrowserRenderer:
     This provides pixel-perfect rendering of complex HTML emails
     at the cost of performance (starting a browser is slow).
 
+    The browser keeps one context and a small pool of pages open for as
+    long as it runs. Each render leases a page and returns it afterwards,
+    so only the first render pays for launching Chromium and creating pages.
+
+    Options are passed per render, so renders with different viewports or
+    image blocking can share the one browser and run side by side.
+
     Usage:
         >>> async with BrowserRenderer() as renderer:
         ...     screenshot = await renderer.render(html_content)
 
+        Or share one running browser across renders:
+        >>> renderer = await get_browser_renderer()
+        >>> screenshot = await renderer.render(html_content, options)
+
     Note: Requires playwright to be installed:
         pip install playwright
         playwright install chromium
     """
 
-    def __init__(self, options: BrowserRenderOptions | None = None) -> None:
+    def __init__(
+        self,
+        options: BrowserRenderOptions | None = None,
+        pool_size: int | None = None,
+    ) -> None:
         """
         Initialize the browser renderer.
 
         Args:
-            options: Rendering options.
+            options: Default rendering options, for renders that pass none.
+            pool_size: Number of pages kept open for concurrent renders.
+                       Defaults to min(4, CPU count).
         """
         self.options = options or BrowserRenderOptions()
-        self._browser = None
-        self._playwright = None
+        self.pool_size = pool_size or min(4, os.cpu_count() or 1)
+        self._browser: Browser | None = None
+        self._playwright: Playwright | None = None
+        self._context: BrowserContext | None = None
+        self._page_pool: asyncio.Queue[Page] | None = None
+        # Options of the render each leased page is serving, read by that
+        # page's request filter
+        self._page_options: dict[Page, BrowserRenderOptions] = {}
 
     async def __aenter__(self) -> "BrowserRenderer":
         """Start the browser when entering context."""
@@ -126,17 +224,67 @@ class BrowserRenderer:
             )
 
         self._playwright = await async_playwright().start()
+        args = list(CHROMIUM_ARGS)
+        if hasattr(os, "geteuid") and os.geteuid() == 0:
+            # Chromium refuses to start its sandbox as root
+            args.append("--no-sandbox")
+
         self._browser = await self._playwright.chromium.launch(
             headless=True,
-            args=[
-                "--disable-gpu",
-                "--disable-software-rasterizer",
-                "--no-sandbox",
-            ],
+            args=args,
+        )
+
+        # One context shared by all pages, with pages created up front
+        self._context = await self._browser.new_context(
+            viewport={
+                "width": self.options.viewport_width,
+                "height": self.options.viewport_height,
+            },
         )
+        self._page_pool = asyncio.Queue()
+        for _ in range(self.pool_size):
+            self._page_pool.put_nowait(await self._new_page())
+
+    async def _new_page(self) -> "Page":
+        """Open a page whose requests are filtered by _route_request()."""
+        if self._context is None:
+            raise RuntimeError("Browser renderer is not running.")
+        page = await self._context.new_page()
+        await page.route("**/*", functools.partial(self._route_request, page))
+        return page
+
+    async def _route_request(self, page: "Page", route: "Route") -> None:
+        """
+        Abort network requests that can only slow the render down.
+
+        Fonts, media and the like are always blocked; remote images are
+        blocked when the options of the render the page is serving set
+        block_images. Inline data: URIs are always allowed.
+        """
+        options = self._page_options.get(page, self.options)
+        request = route.request
+        resource_type = request.resource_type
+        if not request.url.startswith("data:") and (
+            resource_type in BLOCKED_RESOURCE_TYPES
+            or (resource_type == "image" and options.block_images)
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    @property
+    def is_running(self) -> bool:
+        """Returns True if the browser has been started."""
+        return self._browser is not None
 
     async def stop(self) -> None:
         """Stop the headless browser."""
+        # Pages leased by in-flight renders are closed along with the context
+        self._page_pool = None
+        self._page_options.clear()
+        if self._context:
+            await self._context.close()
+            self._context = None
         if self._browser:
             await self._browser.close()
             self._browser = None
@@ -144,93 +292,227 @@ class BrowserRenderer:
             await self._playwright.stop()
             self._playwright = None
 
-    async def render(self, html: str) -> bytes:
+    async def render(
+        self,
+        html: str,
+        options: BrowserRenderOptions | None = None,
+    ) -> bytes:
         """
         Render HTML content and return a screenshot.
 
         Args:
             html: HTML content to render.
+            options: Rendering options for this render. Defaults to the
+                     options the renderer was created with.
 
         Returns:
-            PNG screenshot bytes.
+            Screenshot bytes in options.screenshot_format (PNG by default).
 
         Raises:
-            RuntimeError: If browser not started.
+            RuntimeError: If the browser is not started, or was stopped.
         """
-        if not self._browser:
-            raise RuntimeError("Browser not started. Call start() first or use async with.")
+        pool = self._page_pool
+        if not self._browser or pool is None:
+            raise RuntimeError(
+                "Browser renderer is not running. Call start() first or use async with."
+            )
+        options = options or self.options
 
-        # Create a new page
-        page = await self._browser.new_page(
-            viewport={
-                "width": self.options.viewport_width,
-                "height": self.options.viewport_height,
-            },
-        )
+        # Lease a page from the pool (waits if every page is busy)
+        page = await pool.get()
+        self._page_options[page] = options
 
         try:
-            # Load HTML content
-            await page.set_content(html, wait_until="networkidle")
-
-            # Inject dark mode CSS if enabled
-            if self.options.dark_mode:
-                await page.add_style_tag(content=DARK_MODE_CSS)
-
-            # Inject additional custom CSS if provided
-            if self.options.inject_css:
-                await page.add_style_tag(content=self.options.inject_css)
-
-            # Wait for images to load
-            await page.wait_for_timeout(500)  # Small delay for any async content
+            # The page's last render may have used another viewport
+            viewport = {
+                "width": options.viewport_width,
+                "height": options.viewport_height,
+            }
+            if page.viewport_size != viewport:
+                await page.set_viewport_size(viewport)
+
+            # Load HTML content - emails have no scripts to wait on, so the
+            # parsed DOM is enough; images are awaited explicitly below
+            await page.set_content(
+                html + _style_tag(options),
+                wait_until="domcontentloaded",
+                timeout=options.wait_timeout,
+            )
 
-            # Get the actual content height
+            # Wait for images and measure the content height
             content_height = await page.evaluate(
-                "() => document.body.scrollHeight"
+                PREPARE_PAGE_JS,
+                options.image_timeout,
             )
 
-            # Resize viewport to fit content
-            await page.set_viewport_size({
-                "width": self.options.viewport_width,
-                "height": min(content_height, 4000),  # Cap at 4000px
-            })
+            # Clip the full-page capture to the content, so short emails
+            # aren't padded out to the viewport height - no viewport resize
+            # round trip needed
+            clip = {
+                "x": 0,
+                "y": 0,
+                "width": options.viewport_width,
+                "height": max(content_height, 1),
+            }
 
             # Take screenshot
-            screenshot = await page.screenshot(
-                type="png",
-                full_page=True,
-            )
+            if options.screenshot_format == "jpeg":
+                screenshot = await page.screenshot(
+                    type="jpeg",
+                    quality=options.screenshot_quality,
+                    full_page=True,
+                    clip=clip,
+                )
+            else:
+                screenshot = await page.screenshot(
+                    type="png",
+                    full_page=True,
+                    clip=clip,
+                )
 
             return screenshot
 
         finally:
-            await page.close()
+            self._page_options.pop(page, None)
+            await self._release_page(pool, page)
+
+    async def _release_page(self, pool: "asyncio.Queue[Page]", page: "Page") -> None:
+        """
+        Blank a leased page and return it to the pool.
 
-    async def render_to_file(self, html: str, output_path: Path) -> None:
+        A page that can no longer navigate (crashed, or closed by stop())
+        is replaced with a fresh one while the browser is still running.
+
+        Args:
+            pool: The pool the page was leased from.
+            page: The page to return.
+        """
+        if pool is not self._page_pool:
+            # Browser was stopped or restarted while this render ran
+            return
+        try:
+            await page.goto("about:blank")
+        except Exception:
+            try:
+                await page.close()
+            except Exception:
+                pass
+            if pool is not self._page_pool:
+                return
+            page = await self._new_page()
+        pool.put_nowait(page)
+
+    async def render_to_file(
+        self,
+        html: str,
+        output_path: Path,
+        options: BrowserRenderOptions | None = None,
+    ) -> None:
         """
         Render HTML and save screenshot to file.
 
         Args:
             html: HTML content to render.
-            output_path: Path to save PNG screenshot.
+            output_path: Path to save the screenshot (PNG or JPEG per options).
+            options: Rendering options, as for render().
         """
-        screenshot = await self.render(html)
+        screenshot = await self.render(html, options)
         output_path.write_bytes(screenshot)
 
 
+# =============================================================================
+# Shared Renderer
+# =============================================================================
+
+_shared_renderer: BrowserRenderer | None = None
+_shared_lock = asyncio.Lock()
+
+
+async def get_browser_renderer() -> BrowserRenderer:
+    """
+    Return the process-wide browser renderer, starting it on first use.
+
+    Reusing one running browser avoids relaunching Chromium for every
+    email. Callers pass their options to render(), since the renderer is
+    shared. Call shutdown_browser_renderer() when the app exits.
+
+    Returns:
+        A started BrowserRenderer.
+    """
+    global _shared_renderer
+
+    async with _shared_lock:
+        if _shared_renderer is None or not _shared_renderer.is_running:
+            renderer = BrowserRenderer()
+            await renderer.start()
+            _shared_renderer = renderer
+        return _shared_renderer
+
+
+async def shutdown_browser_renderer() -> None:
+    """Stop the shared browser renderer if one was started."""
+    global _shared_renderer
+
+    async with _shared_lock:
+        if _shared_renderer is not None:
+            await _shared_renderer.stop()
+            _shared_renderer = None
+
+
+def _playwright_browsers_dir() -> Path:
+    """
+    Locate the folder Playwright installs its browsers into.
+
+    Mirrors Playwright's own lookup: PLAYWRIGHT_BROWSERS_PATH wins ("0"
+    means inside the installed package), otherwise the per-user cache.
+
+    Returns:
+        Path to the browsers folder (may not exist).
+    """
+    override = os.environ.get("PLAYWRIGHT_BROWSERS_PATH")
+    if override == "0":
+        import playwright
+        return Path(playwright.__file__).parent / "driver" / "package" / ".local-browsers"
+    if override:
+        return Path(override)
+
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "ms-playwright"
+    if sys.platform == "win32":
+        local = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+        return Path(local) / "ms-playwright"
+    cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache) / "ms-playwright"
+
+
+@functools.cache
+def _check_playwright() -> bool:
+    """
+    Synchronous, cached body of is_playwright_available().
+
+    Neither the installed package nor the installed browsers change while
+    we're running, so the filesystem is only probed once per process.
+    """
+    try:
+        import playwright.async_api  # noqa: F401
+    except ImportError:
+        return False
+
+    # "playwright install chromium" drops a marker file once a browser
+    # (chromium-* or the chromium_headless_shell-* used for headless
+    # launches) is fully unpacked
+    browsers = _playwright_browsers_dir()
+    return any(browsers.glob("chromium*-*/INSTALLATION_COMPLETE"))
+
+
 async def is_playwright_available() -> bool:
     """
     Check if playwright is installed and has a browser.
 
+    Looks for the package and a completed Chromium install on disk instead
+    of launching a browser, which costs hundreds of milliseconds.
+
     Returns:
         True if browser rendering is available.
     """
-    try:
-        from playwright.async_api import async_playwright
-        async with async_playwright() as p:
-            # Check if chromium is installed
-            # This will fail if not installed
-            browser = await p.chromium.launch(headless=True)
-            await browser.close()
-        return True
-    except Exception:
-        return False
+    return _check_playwright()
@@ -10,31 +10,61 @@
 #   - Produces Textual-compatible output
 # =============================================================================
 
+import asyncio
+import functools
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from enum import Enum, auto
+from enum import IntEnum
+from hashlib import blake2b
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from hawk_tui.config import Config
+
 if TYPE_CHECKING:
     from hawk_tui.core import Message
     from hawk_tui.config import RenderingConfig
+    from hawk_tui.rendering.browser import BrowserRenderOptions
+    from hawk_tui.rendering.text import TextRenderer
+
 
+logger = logging.getLogger(__name__)
 
-class RenderMode(Enum):
+
+class RenderMode(IntEnum):
     """Available rendering modes."""
-    FAST = auto()       # inscriptis-based text rendering
-    BROWSER = auto()    # Headless browser rendering
-    AUTO = auto()       # Auto-select based on content
+    FAST = 1            # inscriptis-based text rendering
+    BROWSER = 2         # Headless browser rendering
+    AUTO = 3            # Auto-select based on content
 
 
-class ImageProtocol(Enum):
+class ImageProtocol(IntEnum):
     """Terminal graphics protocols."""
-    SIXEL = auto()      # Sixel graphics (widely supported)
-    KITTY = auto()      # Kitty graphics protocol (high quality)
-    NONE = auto()       # No image support (text only)
+    SIXEL = 1           # Sixel graphics (widely supported)
+    KITTY = 2           # Kitty graphics protocol (high quality)
+    NONE = 3            # No image support (text only)
+
 
+# rendering.mode config values (unknown values behave like "auto")
+_CONFIG_MODES = {
+    "fast": RenderMode.FAST,
+    "browser": RenderMode.BROWSER,
+    "auto": RenderMode.AUTO,
+}
 
-@dataclass
+# rendering.image_protocol config values that bypass auto-detection
+_CONFIG_PROTOCOLS = {
+    "sixel": ImageProtocol.SIXEL,
+    "kitty": ImageProtocol.KITTY,
+    "none": ImageProtocol.NONE,
+}
+
+
+@dataclass(slots=True)
 class RenderedImage:
     """
     An image rendered for terminal display.
@@ -55,7 +85,7 @@ class RenderedImage:
     placeholder: str = "[image]"
 
 
-@dataclass
+@dataclass(slots=True)
 class RenderResult:
     """
     Result of rendering an email.
@@ -99,6 +129,17 @@ class RenderEngine:
         cache_dir: Directory for cached rendered content.
     """
 
+    # Rendered results kept in memory (least recently used evicted first)
+    MEM_CACHE_SIZE = 256
+
+    # On-disk cache limits. Once it grows past DISK_CACHE_MAX_BYTES, least
+    # recently used entries are pruned down to DISK_CACHE_PRUNE_TO. Entries
+    # unused for DISK_CACHE_MAX_AGE seconds are dropped as well, so rendered
+    # copies of deleted messages don't linger.
+    DISK_CACHE_MAX_BYTES = 64 * 1024 * 1024
+    DISK_CACHE_PRUNE_TO = 48 * 1024 * 1024
+    DISK_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+
     def __init__(
         self,
         config: "RenderingConfig",
@@ -112,10 +153,27 @@ class RenderEngine:
             cache_dir: Directory for caching. Defaults to XDG cache.
         """
         self.config = config
-        self.cache_dir = cache_dir
+        self.cache_dir = cache_dir or Config.cache_dir() / "rendered"
+
+        # In-memory LRU of successful renders, keyed by _cache_key()
+        self._mem_cache: OrderedDict[str, RenderResult] = OrderedDict()
+
+        # Approximate size of the disk cache in bytes, measured by the first
+        # write of the session (None until then)
+        self._disk_cache_bytes: int | None = None
+        self._disk_cache_pruning = False
+
+        # Created lazily by _get_text_renderer() (imports inscriptis)
+        self._text_renderer: TextRenderer | None = None
 
         # Detect terminal capabilities
-        self._image_protocol = self._detect_image_protocol()
+        self._image_protocol = _probe_image_protocol(config.image_protocol)
+
+        # Renderer for each concrete mode
+        self._mode_dispatch = {
+            RenderMode.FAST: self._render_fast,
+            RenderMode.BROWSER: self._render_browser,
+        }
 
     async def render(
         self,
@@ -133,24 +191,252 @@ class RenderEngine:
         Returns:
             RenderResult with rendered content.
         """
-        # Check cache first
-        # TODO: Implement caching
-
         # Determine rendering mode
-        if force_mode:
+        if force_mode is not None:
             mode = force_mode
-        elif self.config.mode == "fast":
-            mode = RenderMode.FAST
-        elif self.config.mode == "browser":
-            mode = RenderMode.BROWSER
-        else:  # auto
+        else:
+            mode = _CONFIG_MODES.get(self.config.mode, RenderMode.AUTO)
+        if mode == RenderMode.AUTO:
             mode = self._analyze_and_choose_mode(message)
 
+        # Check cache first
+        key = self._cache_key(message, mode)
+        cached = await self._cache_get(key)
+        if cached is not None:
+            return cached
+
         # Render based on mode
-        if mode == RenderMode.FAST:
-            return await self._render_fast(message)
+        result = await self._mode_dispatch[mode](message)
+
+        # Only successful renders are cached, so failures are retried
+        if result.success:
+            await self._cache_put(key, result)
+        return result
+
+    async def render_many(
+        self,
+        messages: "list[Message]",
+        *,
+        concurrency: int = 4,
+        force_mode: RenderMode | None = None,
+    ) -> list[RenderResult]:
+        """
+        Render several messages concurrently.
+
+        At most `concurrency` renders run at once. The default matches the
+        browser renderer's largest page pool, so browser renders never queue
+        for a page while holding a slot.
+
+        Args:
+            messages: Messages to render.
+            concurrency: Maximum number of renders in flight.
+            force_mode: Override auto-detection and use this mode.
+
+        Returns:
+            RenderResults in the same order as `messages`.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def render_one(message: "Message") -> RenderResult:
+            async with semaphore:
+                return await self.render(message, force_mode=force_mode)
+
+        return await asyncio.gather(*(render_one(m) for m in messages))
+
+    # -------------------------------------------------------------------------
+    # Render cache
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def _cache_key(message: "Message", mode: RenderMode) -> str:
+        """
+        Build the cache key for a message's content and rendering mode.
+
+        Keyed by content rather than message ID, so the same email in two
+        folders (or re-synced after a UIDVALIDITY change) shares one entry.
+        """
+        body = message.body_html or message.body_text or ""
+        digest = blake2b(body.encode("utf-8", errors="replace"), digest_size=16)
+        return f"{digest.hexdigest()}-{mode.name.lower()}"
+
+    async def _cache_get(self, key: str) -> RenderResult | None:
+        """
+        Look up a rendered result in memory, then on disk.
+
+        Returns:
+            A copy of the cached result marked cached=True, or None on a miss.
+        """
+        result = self._mem_cache.get(key)
+        if result is not None:
+            self._mem_cache.move_to_end(key)
         else:
-            return await self._render_browser(message)
+            # Disk I/O runs off the event loop, like rendering itself
+            result = await asyncio.to_thread(self._disk_cache_read, key)
+            if result is None:
+                return None
+            self._mem_cache_store(key, result)
+
+        return RenderResult(
+            text=result.text,
+            images=result.images,
+            mode_used=result.mode_used,
+            cached=True,
+        )
+
+    async def _cache_put(self, key: str, result: RenderResult) -> None:
+        """Store a freshly rendered result in memory and on disk."""
+        self._mem_cache_store(key, result)
+        size = await asyncio.to_thread(self._disk_cache_write, key, result)
+        if size is not None:
+            await self._disk_cache_written(size)
+
+    def _mem_cache_store(self, key: str, result: RenderResult) -> None:
+        """Insert into the in-memory LRU, evicting the oldest entry if full."""
+        self._mem_cache[key] = result
+        self._mem_cache.move_to_end(key)
+        if len(self._mem_cache) > self.MEM_CACHE_SIZE:
+            self._mem_cache.popitem(last=False)
+
+    def _disk_cache_path(self, key: str) -> Path:
+        """Path of a cache entry, sharded by the first two hex digits."""
+        return self.cache_dir / key[:2] / key
+
+    def _disk_cache_read(self, key: str) -> RenderResult | None:
+        """
+        Load a cached result from disk.
+
+        Layout: <key>.json holds the text and image metadata; each image's
+        data is stored alongside as <key>.<index>.img.
+        """
+        path = self._disk_cache_path(key)
+        try:
+            meta_path = path.with_suffix(".json")
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            images = [
+                RenderedImage(
+                    content_id=img["content_id"],
+                    protocol=ImageProtocol[img["protocol"]],
+                    data=path.with_suffix(f".{i}.img").read_bytes(),
+                    width=img["width"],
+                    height=img["height"],
+                    placeholder=img["placeholder"],
+                )
+                for i, img in enumerate(meta["images"])
+            ]
+            # Mark the entry as recently used for _disk_cache_prune()
+            os.utime(meta_path)
+            return RenderResult(
+                text=meta["text"],
+                images=images,
+                mode_used=RenderMode[meta["mode"]],
+            )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable render cache entry {key}: {e}")
+            return None
+
+    def _disk_cache_write(self, key: str, result: RenderResult) -> int | None:
+        """
+        Persist a rendered result to disk (best effort).
+
+        Returns:
+            Bytes written, or None if the entry could not be written.
+        """
+        path = self._disk_cache_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            size = 0
+            for i, img in enumerate(result.images):
+                size += path.with_suffix(f".{i}.img").write_bytes(img.data)
+            meta = {
+                "text": result.text,
+                "mode": result.mode_used.name,
+                "images": [
+                    {
+                        "content_id": img.content_id,
+                        "protocol": img.protocol.name,
+                        "width": img.width,
+                        "height": img.height,
+                        "placeholder": img.placeholder,
+                    }
+                    for img in result.images
+                ],
+            }
+            # Metadata last: an entry is only visible once its images exist
+            size += path.with_suffix(".json").write_text(json.dumps(meta), encoding="utf-8")
+        except OSError as e:
+            logger.debug(f"Could not write render cache entry {key}: {e}")
+            return None
+        return size
+
+    async def _disk_cache_written(self, size: int) -> None:
+        """
+        Account for a new disk cache entry, pruning the cache if needed.
+
+        The first write of a session measures the cache (and drops expired
+        entries); later ones add to the running total until it passes
+        DISK_CACHE_MAX_BYTES.
+
+        Args:
+            size: Approximate size of the entry in bytes.
+        """
+        if self._disk_cache_bytes is not None:
+            self._disk_cache_bytes += size
+            if self._disk_cache_bytes <= self.DISK_CACHE_MAX_BYTES:
+                return
+        if self._disk_cache_pruning:
+            # A prune started by a concurrent render re-measures the cache
+            return
+        self._disk_cache_pruning = True
+        try:
+            self._disk_cache_bytes = await asyncio.to_thread(self._disk_cache_prune)
+        finally:
+            self._disk_cache_pruning = False
+
+    def _disk_cache_prune(self) -> int:
+        """
+        Delete expired entries, then least recently used ones while over size.
+
+        Covers both rendered results and browser screenshots. An entry is
+        all the files sharing its key; its age is that of its newest file.
+
+        Returns:
+            Bytes left in the cache.
+        """
+        # (directory, key) -> (path, mtime, size) of each of the entry's files
+        entries: dict[tuple[str, str], list[tuple[str, float, int]]] = {}
+        total = 0
+        for dirpath, _, filenames in os.walk(self.cache_dir):
+            for name in filenames:
+                file_path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(file_path)
+                except OSError:
+                    continue
+                entries.setdefault((dirpath, name.split(".", 1)[0]), []).append(
+                    (file_path, st.st_mtime, st.st_size)
+                )
+                total += st.st_size
+
+        cutoff = time.time() - self.DISK_CACHE_MAX_AGE
+        target = self.DISK_CACHE_PRUNE_TO if total > self.DISK_CACHE_MAX_BYTES else total
+        removed = 0
+        for files in sorted(entries.values(), key=lambda f: max(m for _, m, _ in f)):
+            if max(m for _, m, _ in files) >= cutoff and total <= target:
+                break
+            # Metadata first, so a half-deleted entry reads as a miss
+            for file_path, _, size in sorted(files, key=lambda f: not f[0].endswith(".json")):
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    continue
+                total -= size
+            removed += 1
+
+        if removed:
+            logger.debug(f"Pruned {removed} render cache entries ({total} bytes left)")
+        return total
 
     async def _render_fast(self, message: "Message") -> RenderResult:
         """
@@ -161,18 +447,13 @@ class RenderEngine:
             - Handles headings, lists, tables, links, etc.
             - Shows image placeholders
         """
-        from hawk_tui.rendering.text import TextRenderer, TextRenderOptions
-
         try:
             # Prefer HTML if available, fall back to plain text
             if message.body_html:
-                options = TextRenderOptions(
-                    display_links="inline",
-                    display_images="placeholder",
-                    show_link_urls=False,  # Keep it cleaner
-                )
-                renderer = TextRenderer(options)
-                text = renderer.render(message.body_html)
+                renderer = self._get_text_renderer()
+                # CPU-bound parsing - run off the event loop so the UI (and
+                # any concurrent renders) keep going
+                text = await asyncio.to_thread(renderer.render, message.body_html)
                 return RenderResult(text=text, mode_used=RenderMode.FAST)
             elif message.body_text:
                 return RenderResult(text=message.body_text, mode_used=RenderMode.FAST)
@@ -192,6 +473,25 @@ class RenderEngine:
                 error=str(e)
             )
 
+    def _get_text_renderer(self) -> "TextRenderer":
+        """
+        Return the engine's TextRenderer, creating it on first use.
+
+        The renderer holds no per-render state, so one instance (and its
+        parser configuration) is shared by every fast render, including
+        concurrent ones running in worker threads.
+        """
+        if self._text_renderer is None:
+            from hawk_tui.rendering.text import TextRenderer, TextRenderOptions
+
+            options = TextRenderOptions(
+                display_links="inline",
+                display_images="placeholder",
+                show_link_urls=False,  # Keep it cleaner
+            )
+            self._text_renderer = TextRenderer(options)
+        return self._text_renderer
+
     async def _render_browser(self, message: "Message") -> RenderResult:
         """
         Render using headless browser (high-fidelity rendering).
@@ -203,18 +503,92 @@ class RenderEngine:
 
         Requires playwright to be installed.
         """
-        # TODO: Implement browser rendering
-        # 1. Start/connect to headless browser
-        # 2. Load HTML content
-        # 3. Wait for rendering
-        # 4. Screenshot
-        # 5. Convert to Sixel/Kitty
+        from hawk_tui.rendering.browser import BrowserRenderOptions
+        from hawk_tui.rendering.images import ImageRenderer
+
+        if not message.body_html:
+            # Nothing for a browser to lay out
+            return await self._render_fast(message)
+
+        if self._image_protocol != ImageProtocol.KITTY:
+            return RenderResult(
+                text="[Browser rendering requires Kitty graphics support]",
+                mode_used=RenderMode.BROWSER,
+                error="Browser rendering requires Kitty graphics support",
+            )
+
+        try:
+            # PNG, since the screenshot is sent to Kitty as-is
+            options = BrowserRenderOptions(screenshot_format="png")
+            png_data, cached = await self._browser_screenshot(message.body_html, options)
+        except ImportError as e:
+            return RenderResult(
+                text=f"[Browser rendering unavailable: {e}]",
+                mode_used=RenderMode.BROWSER,
+                error=str(e),
+            )
+        except Exception as e:
+            return RenderResult(
+                text=f"[Rendering error: {e}]",
+                mode_used=RenderMode.BROWSER,
+                error=str(e),
+            )
+
+        renderer = ImageRenderer()
+        image = renderer.load_image(png_data)  # Header only - no pixel decode
+        pixel_width, pixel_height = image.size
         return RenderResult(
-            text="[Browser rendering not yet implemented]",
+            text="",
+            images=[
+                RenderedImage(
+                    content_id=None,
+                    protocol=ImageProtocol.KITTY,
+                    data=renderer.render_kitty_from_png(png_data),
+                    width=-(-pixel_width // renderer.cell_width),
+                    height=-(-pixel_height // renderer.cell_height),
+                )
+            ],
             mode_used=RenderMode.BROWSER,
-            error="Browser rendering not yet implemented",
+            cached=cached,
         )
 
+    async def _browser_screenshot(
+        self,
+        html: str,
+        options: "BrowserRenderOptions",
+    ) -> tuple[bytes, bool]:
+        """
+        Screenshot HTML in the shared headless browser, with a disk cache.
+
+        Identical HTML rendered with identical options always produces the
+        same screenshot, so PNGs are kept under cache_dir/browser/ keyed by
+        a hash of both, and a hit never touches the browser.
+
+        Args:
+            html: HTML content to render.
+            options: Browser rendering options (PNG screenshots).
+
+        Returns:
+            Tuple of (PNG bytes, True if served from the cache).
+        """
+        from hawk_tui.rendering.browser import get_browser_renderer
+
+        digest = blake2b(repr(options).encode("utf-8"), digest_size=16)
+        digest.update(html.encode("utf-8", errors="replace"))
+        key = digest.hexdigest()
+        path = self.cache_dir / "browser" / key[:2] / f"{key}.png"
+        cached = await asyncio.to_thread(_screenshot_cache_read, path)
+        if cached is not None:
+            return cached, True
+
+        renderer = await get_browser_renderer()
+        png_data = await renderer.render(html, options)
+
+        if await asyncio.to_thread(_screenshot_cache_write, path, png_data):
+            await self._disk_cache_written(len(png_data))
+
+        return png_data, False
+
     def _analyze_and_choose_mode(self, message: "Message") -> RenderMode:
         """
         Analyze HTML complexity and choose the best rendering mode.
@@ -229,28 +603,75 @@ class RenderEngine:
         # For now, always use fast mode
         return RenderMode.FAST
 
-    def _detect_image_protocol(self) -> ImageProtocol:
-        """
-        Detect which image protocol the terminal supports.
+    async def clear_cache(self) -> None:
+        """Clear the rendering cache (memory and disk)."""
+        import shutil
 
-        Checks for:
-            - Kitty graphics protocol (via terminfo or direct query)
-            - Sixel support (via terminfo or direct query)
-        """
-        # Check config override
-        if self.config.image_protocol == "sixel":
-            return ImageProtocol.SIXEL
-        elif self.config.image_protocol == "kitty":
-            return ImageProtocol.KITTY
-        elif self.config.image_protocol == "none":
-            return ImageProtocol.NONE
-
-        # Auto-detect
-        # TODO: Implement proper detection
-        # For now, assume no image support to be safe
-        return ImageProtocol.NONE
+        self._mem_cache.clear()
+        await asyncio.to_thread(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        self._disk_cache_bytes = 0
 
-    async def clear_cache(self) -> None:
-        """Clear the rendering cache."""
-        # TODO: Implement cache clearing
-        pass
+
+def _screenshot_cache_read(path: Path) -> bytes | None:
+    """
+    Read a cached browser screenshot, marking it recently used.
+
+    Returns:
+        The PNG bytes, or None on a miss or an unreadable entry.
+    """
+    try:
+        png_data = path.read_bytes()
+        # Mark the entry as recently used for _disk_cache_prune()
+        os.utime(path)
+        return png_data
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.debug(f"Ignoring unreadable screenshot cache entry {path.stem}: {e}")
+        return None
+
+
+def _screenshot_cache_write(path: Path, png_data: bytes) -> bool:
+    """
+    Store a browser screenshot in the cache (best effort).
+
+    Written to a temp file and renamed, so a crash never leaves half a PNG.
+
+    Returns:
+        True if the entry was written.
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(png_data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"Could not write screenshot cache entry {path.stem}: {e}")
+        return False
+    return True
+
+
+@functools.cache
+def _probe_image_protocol(config_override: str | None) -> ImageProtocol:
+    """
+    Detect which image protocol the terminal supports.
+
+    Cached per config value, so engines created repeatedly (e.g. per
+    preview) don't re-probe the environment.
+
+    Checks for:
+        - Kitty graphics protocol (via terminfo or direct query)
+        - Sixel support (via terminfo or direct query)
+
+    Args:
+        config_override: The rendering.image_protocol setting.
+    """
+    # Check config override
+    protocol = _CONFIG_PROTOCOLS.get(config_override)
+    if protocol is not None:
+        return protocol
+
+    # Auto-detect
+    # TODO: Implement proper detection
+    # For now, assume no image support to be safe
+    return ImageProtocol.NONE
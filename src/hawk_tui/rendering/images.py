@@ -14,15 +14,131 @@
 #   4. Return data ready for terminal output
 # =============================================================================
 
+import base64
+import functools
+import io
+import os
 from dataclasses import dataclass
 from io import BytesIO
-from typing import TYPE_CHECKING
+from typing import IO, TYPE_CHECKING, cast
 
 if TYPE_CHECKING:
+    from _typeshed import ReadableBuffer
     from PIL import Image
 
 
-@dataclass
+# First bytes of every PNG file
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Kitty recommends chunks of 4096 bytes
+KITTY_CHUNK_SIZE = 4096
+
+
+class _B64Writer(io.RawIOBase):
+    """
+    Write-only file object that base64-encodes everything written to it.
+
+    Lets Pillow save a PNG straight into its base64 form, so the encoded
+    PNG is never materialised as a separate bytes object. Input is
+    encoded in whole 3-byte groups; the leftover (0-2 bytes) is carried
+    over to the next write and padded on close().
+    """
+
+    def __init__(self) -> None:
+        self.buf = bytearray()
+        self._rem = b""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: "ReadableBuffer") -> int:
+        chunk: bytes | memoryview = memoryview(data)
+        size = len(chunk)
+        if self._rem:
+            chunk = self._rem + bytes(chunk)
+        n = len(chunk) - len(chunk) % 3
+        self.buf += base64.standard_b64encode(chunk[:n])
+        self._rem = bytes(chunk[n:])
+        return size
+
+    def close(self) -> None:
+        if not self.closed and self._rem:
+            self.buf += base64.standard_b64encode(self._rem)
+            self._rem = b""
+        super().close()
+
+
+def _png_base64(image: "Image.Image") -> bytearray:
+    """
+    Encode an image as PNG and return it base64-encoded, in one pass.
+
+    Args:
+        image: PIL Image to encode.
+
+    Returns:
+        Base64 of the PNG file.
+    """
+    writer = _B64Writer()
+    # A RawIOBase is a binary file, but not nominally an IO[bytes]
+    image.save(cast(IO[bytes], writer), format='PNG')
+    writer.close()
+    return writer.buf
+
+
+def _emit_kitty(payload: bytes, first_params: bytes) -> bytes:
+    """
+    Wrap image data in chunked Kitty graphics escape sequences.
+
+    Args:
+        payload: Image data (PNG or raw pixels, as described by first_params).
+        first_params: Control keys for the first chunk, e.g. b"a=T,f=100".
+
+    Returns:
+        Escape sequence bytes, ready to write to the terminal.
+    """
+    return _emit_kitty_b64(base64.standard_b64encode(payload), first_params)
+
+
+def _emit_kitty_b64(b64_data: bytes | bytearray, first_params: bytes) -> bytes:
+    """
+    Wrap already base64-encoded image data in Kitty escape sequences.
+
+    Format: \\033_G<key>=<value>,...;<base64 payload>\\033\\\\
+
+    The base64 output stays as bytes and chunks are copied straight out of a
+    memoryview into one output buffer (no decoded str, no chunk lists).
+
+    Args:
+        b64_data: Base64-encoded image data.
+        first_params: Control keys for the first chunk, e.g. b"a=T,f=100".
+
+    Returns:
+        Escape sequence bytes, ready to write to the terminal.
+    """
+    view = memoryview(b64_data)
+    total = len(b64_data)
+
+    result = bytearray()
+    start = 0
+    while start < total:
+        end = min(start + KITTY_CHUNK_SIZE, total)
+        # m=0 means last chunk, m=1 means more coming
+        m_value = 0 if end == total else 1
+
+        if start == 0:
+            # First chunk includes format and action
+            result += b"\033_G" + first_params + b",m=%d;" % m_value
+        else:
+            # Subsequent chunks just have m and payload
+            result += b"\033_Gm=%d;" % m_value
+        result += view[start:end]
+        result += b"\033\\"
+        start = end
+
+    return bytes(result)
+
+
+@dataclass(frozen=True, slots=True)
 class ImageDimensions:
     """
     Dimensions for image display.
@@ -48,7 +164,7 @@ class ImageRenderer:
     Usage:
         >>> renderer = ImageRenderer(max_width=80, max_height=40)
         >>> sixel_data = renderer.render_sixel(image_bytes)
-        >>> kitty_data = renderer.render_kitty(image_bytes)
+        >>> kitty_data, dims = renderer.render_kitty(image_bytes)
     """
 
     def __init__(
@@ -57,6 +173,7 @@ class ImageRenderer:
         max_height: int = 40,
         cell_width: int = 8,
         cell_height: int = 16,
+        use_png_format: bool = False,
     ) -> None:
         """
         Initialize the image renderer.
@@ -66,11 +183,18 @@ class ImageRenderer:
             max_height: Maximum height in terminal rows.
             cell_width: Pixel width of a terminal cell.
             cell_height: Pixel height of a terminal cell.
+            use_png_format: Send PNG (f=100) to Kitty instead of raw pixels.
+                            Smaller escape sequences, but costs a PNG encode.
         """
         self.max_width = max_width
         self.max_height = max_height
         self.cell_width = cell_width
         self.cell_height = cell_height
+        self.use_png_format = use_png_format
+
+        # Default pixel bounds, so resize_image() only multiplies on overrides
+        self._pixel_max_w = max_width * cell_width
+        self._pixel_max_h = max_height * cell_height
 
     def load_image(self, data: bytes) -> "Image.Image":
         """
@@ -94,7 +218,9 @@ class ImageRenderer:
         """
         Resize image to fit terminal constraints.
 
-        Maintains aspect ratio while fitting within max dimensions.
+        Maintains aspect ratio while fitting within max dimensions. The image
+        is downscaled in place with Image.thumbnail() (bilinear, never
+        upscaled), which also lets JPEGs decode at reduced size.
 
         Args:
             image: PIL Image to resize.
@@ -104,19 +230,14 @@ class ImageRenderer:
         Returns:
             Tuple of (resized image, dimensions).
         """
-        max_w = (max_width or self.max_width) * self.cell_width
-        max_h = (max_height or self.max_height) * self.cell_height
+        from PIL import Image
 
-        # Calculate new size maintaining aspect ratio
-        width, height = image.size
-        ratio = min(max_w / width, max_h / height)
+        max_w = max_width * self.cell_width if max_width else self._pixel_max_w
+        max_h = max_height * self.cell_height if max_height else self._pixel_max_h
 
-        if ratio < 1:
-            new_width = int(width * ratio)
-            new_height = int(height * ratio)
-            image = image.resize((new_width, new_height))
-        else:
-            new_width, new_height = width, height
+        # Shrink in place, maintaining aspect ratio (no-op if it already fits)
+        image.thumbnail((max_w, max_h), Image.Resampling.BILINEAR)
+        new_width, new_height = image.size
 
         # Calculate terminal dimensions
         cell_width = (new_width + self.cell_width - 1) // self.cell_width
@@ -156,12 +277,15 @@ class ImageRenderer:
         data: bytes,
         max_width: int | None = None,
         max_height: int | None = None,
-    ) -> tuple[str, ImageDimensions]:
+    ) -> tuple[bytes, ImageDimensions]:
         """
         Render image using Kitty graphics protocol.
 
-        The Kitty protocol transmits images as base64-encoded PNG data
-        with escape sequences for positioning and display.
+        The Kitty protocol transmits images as base64-encoded pixel data
+        with escape sequences for positioning and display. By default the
+        raw pixels are sent (f=24 RGB, or f=32 when the image has real
+        transparency), which skips PNG compression entirely; the terminal
+        is local, so CPU matters more than the extra bytes.
 
         Args:
             data: Image data (PNG, JPEG, etc.)
@@ -169,97 +293,76 @@ class ImageRenderer:
             max_height: Max height in terminal rows.
 
         Returns:
-            Tuple of (kitty escape sequence string, dimensions).
+            Tuple of (kitty escape sequence bytes, dimensions).
         """
-        import base64
-        from PIL import Image
-
         # Load and resize image
         image = self.load_image(data)
 
-        # Convert to RGB if necessary (Kitty needs RGB/RGBA)
-        if image.mode not in ('RGB', 'RGBA'):
-            image = image.convert('RGBA')
+        # Palette images must be expanded before they can be resampled
+        if image.mode in ('P', '1'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
 
         # Resize to fit terminal
         image, dims = self.resize_image(image, max_width, max_height)
 
-        # Save as PNG to bytes
-        output = BytesIO()
-        image.save(output, format='PNG')
-        png_data = output.getvalue()
-
-        # Build Kitty graphics escape sequence
-        # Format: \033_G<key>=<value>,...;<payload>\033\\
-        # We use: a=T (transmit), f=100 (PNG), chunked transmission
-
-        b64_data = base64.standard_b64encode(png_data).decode('ascii')
-
-        # Kitty recommends chunks of 4096 bytes
-        chunk_size = 4096
-        chunks = [b64_data[i:i+chunk_size] for i in range(0, len(b64_data), chunk_size)]
-
-        result = []
-        for i, chunk in enumerate(chunks):
-            is_last = (i == len(chunks) - 1)
-            # m=0 means last chunk, m=1 means more coming
-            m_value = 0 if is_last else 1
-
-            if i == 0:
-                # First chunk includes format and action
-                # a=T: transmit and display
-                # f=100: PNG format
-                # c,r: columns and rows to display (optional, for sizing)
-                result.append(f"\033_Ga=T,f=100,m={m_value};{chunk}\033\\")
-            else:
-                # Subsequent chunks just have m and payload
-                result.append(f"\033_Gm={m_value};{chunk}\033\\")
-
-        return ''.join(result), dims
+        # Kitty needs RGB/RGBA. Decide once whether alpha carries any
+        # information (fully opaque alpha doesn't) and convert at most once;
+        # RGB sources such as JPEGs go straight through.
+        has_alpha = (
+            'A' in image.getbands()
+            and image.getchannel('A').getextrema()[0] < 255
+        )
+        target_mode = 'RGBA' if has_alpha else 'RGB'
+        if image.mode != target_mode:
+            image = image.convert(target_mode)
+
+        # Build the chunked Kitty graphics escape sequence (a=T: transmit
+        # and display)
+        if self.use_png_format:
+            # f=100: PNG format, encoded straight to base64
+            return _emit_kitty_b64(_png_base64(image), b"a=T,f=100"), dims
+
+        # f=24/32: raw RGB/RGBA pixels, s,v: width and height in pixels
+        header = b"a=T,f=%d,s=%d,v=%d" % (
+            32 if has_alpha else 24,
+            image.width,
+            image.height,
+        )
+        return _emit_kitty(image.tobytes(), header), dims
 
     def render_kitty_from_png(
         self,
         png_data: bytes,
         cols: int | None = None,
         rows: int | None = None,
-    ) -> str:
+    ) -> bytes:
         """
         Render PNG data directly using Kitty protocol without resizing.
 
         Useful when you already have appropriately sized PNG data
-        (e.g., from browser screenshot).
+        (e.g., from browser screenshot). Kitty only accepts PNG or raw
+        pixels, so other formats (such as a JPEG screenshot) are decoded
+        and re-encoded as PNG first.
 
         Args:
-            png_data: PNG image bytes.
+            png_data: PNG image bytes (other formats are converted).
             cols: Number of columns to span (optional).
             rows: Number of rows to span (optional).
 
         Returns:
-            Kitty escape sequence string ready to print.
+            Kitty escape sequence bytes, ready to write to the terminal.
         """
-        import base64
-
-        b64_data = base64.standard_b64encode(png_data).decode('ascii')
-        chunk_size = 4096
-        chunks = [b64_data[i:i+chunk_size] for i in range(0, len(b64_data), chunk_size)]
-
-        result = []
-        for i, chunk in enumerate(chunks):
-            is_last = (i == len(chunks) - 1)
-            m_value = 0 if is_last else 1
-
-            if i == 0:
-                # First chunk - include display params
-                params = f"a=T,f=100,m={m_value}"
-                if cols:
-                    params += f",c={cols}"
-                if rows:
-                    params += f",r={rows}"
-                result.append(f"\033_G{params};{chunk}\033\\")
-            else:
-                result.append(f"\033_Gm={m_value};{chunk}\033\\")
-
-        return ''.join(result)
+        # a=T: transmit and display, f=100: PNG format,
+        # c,r: columns and rows to display (optional, for sizing)
+        params = b"a=T,f=100"
+        if cols:
+            params += b",c=%d" % cols
+        if rows:
+            params += b",r=%d" % rows
+
+        if not png_data.startswith(PNG_SIGNATURE):
+            return _emit_kitty_b64(_png_base64(self.load_image(png_data)), params)
+        return _emit_kitty(png_data, params)
 
     def render_placeholder(
         self,
@@ -285,31 +388,35 @@ class ImageRenderer:
         return "[image]"
 
 
-def detect_terminal_capabilities() -> dict:
+@dataclass(frozen=True)
+class TerminalCapabilities:
+    """
+    Terminal graphics capabilities.
+
+    Attributes:
+        sixel: Sixel support detected.
+        kitty: Kitty graphics protocol supported.
+        cell_size: (width, height) of terminal cells in pixels.
+    """
+    sixel: bool = False
+    kitty: bool = False
+    cell_size: tuple[int, int] = (8, 16)  # Default assumption
+
+
+@functools.cache
+def detect_terminal_capabilities() -> TerminalCapabilities:
     """
     Detect terminal graphics capabilities.
 
-    Returns dict with:
-        - sixel: bool, Sixel support detected
-        - kitty: bool, Kitty protocol supported
-        - cell_size: tuple, (width, height) of terminal cells in pixels
+    The terminal cannot change underneath a running process, so detection
+    runs once and the (immutable) result is reused by every caller.
 
     Detection methods:
         - Check $TERM and terminfo
         - Query terminal directly (DA1, Kitty detection)
     """
-    import os
-    import sys
-
-    capabilities = {
-        "sixel": False,
-        "kitty": False,
-        "cell_size": (8, 16),  # Default assumption
-    }
-
     # Check for Kitty
-    if os.environ.get("KITTY_WINDOW_ID"):
-        capabilities["kitty"] = True
+    kitty = bool(os.environ.get("KITTY_WINDOW_ID"))
 
     # Check TERM for sixel support hints
     term = os.environ.get("TERM", "")
@@ -323,4 +430,4 @@ def detect_terminal_capabilities() -> dict:
     # 2. Parse response for sixel support
     # 3. Query Kitty with special sequence
 
-    return capabilities
+    return TerminalCapabilities(kitty=kitty)
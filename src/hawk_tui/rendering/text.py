@@ -11,16 +11,509 @@
 # We add Rich markup on top for terminal styling.
 # =============================================================================
 
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+import functools
+import html as html_lib
 import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, AnyStr, Generic
 
-from inscriptis import get_text
-from inscriptis.model.config import ParserConfig
-from inscriptis.css_profiles import CSS_PROFILES
+# inscriptis is imported where it's used: it pulls in lxml and costs ~20ms,
+# which would otherwise land on every app start
 
 if TYPE_CHECKING:
-    pass
+    from inscriptis.model.config import ParserConfig
+
+
+# =============================================================================
+# Compiled Patterns
+# =============================================================================
+# Compiled once at import; the bound .sub() methods skip the re module's
+# pattern cache lookup on every render.
+
+# Office namespace tags (<o:p>, <v:rect>, ...) left over once
+# _strip_blocks() has removed the bulk of the markup
+_RE_OFFICE_NS = re.compile(r'<o:[^>]*>.*?</o:[^>]*>|<v:[^>]*>.*?</v:[^>]*>', re.DOTALL)
+_RE_OFFICE_NS_BYTES = re.compile(_RE_OFFICE_NS.pattern.encode(), re.DOTALL)
+
+# Output cleanup
+_RE_ZWSP = re.compile(r'[\u200b\u200c\u200d\u2060\ufeff]+')
+# Trailing whitespace (anything str.rstrip() would strip) before a newline
+_RE_TRAIL_WS = re.compile(r'[^\S\n]+(?=\n)')
+
+
+# =============================================================================
+# Block Stripping
+# =============================================================================
+# Style/script blocks and conditional comments are by far the bulk of what
+# pre-cleaning removes. Finding them with str.find() on a lowercased copy
+# avoids the character-by-character .*? walk a regex does over large
+# marketing emails. The scanner works on str or (undecoded) bytes alike.
+
+# Maps A-Z to a-z only, so offsets in the result match the original
+_ASCII_LOWER = str.maketrans(
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'
+)
+
+# (opener, closer) for each kind of block _strip_blocks() removes
+_STRIP_BLOCKS = (
+    ('<!--[if', '<![endif]-->'),    # IE/MSO conditional comments
+    ('<![if', '<![endif]>'),        # Bare (downlevel-revealed) conditionals
+    ('<style', '</style>'),
+    ('<script', '</script>'),
+    ('<?xml', '?>'),
+)
+
+# Indexes into _STRIP_BLOCKS for the kinds with special opening tags
+_KIND_XML = 4
+_CONDITIONAL_KINDS = (0, 1)
+
+
+@dataclass(frozen=True, slots=True)
+class _ScanTokens(Generic[AnyStr]):
+    """The literals the block scanner looks for, as str or as bytes."""
+    blocks: tuple[tuple[AnyStr, AnyStr], ...]
+    gt: AnyStr
+    bracket: AnyStr
+    qmark: AnyStr
+    mso: AnyStr
+
+
+_SCAN_TOKENS_STR = _ScanTokens(_STRIP_BLOCKS, '>', ']', '?', '<!--[if gte mso')
+_SCAN_TOKENS_BYTES = _ScanTokens(
+    tuple((opener.encode(), closer.encode()) for opener, closer in _STRIP_BLOCKS),
+    b'>', b']', b'?', b'<!--[if gte mso',
+)
+
+
+def _scan_tokens(html: AnyStr) -> _ScanTokens[AnyStr]:
+    """Get the scanner literals matching the type of html."""
+    if isinstance(html, bytes):
+        return _SCAN_TOKENS_BYTES
+    return _SCAN_TOKENS_STR
+
+
+# Text held back between chunks in _strip_blocks_stream(), enough for an
+# opener split across the boundary
+_OPENER_CARRY = max(len(opener) for opener, _ in _STRIP_BLOCKS) - 1
+
+# _block_body_start() result when the opening tag runs past the text
+_INCOMPLETE = -2
+
+
+def _lower(html: AnyStr) -> AnyStr:
+    """Lowercase html without changing any character offsets."""
+    lowered = html.lower()
+    if isinstance(html, bytes):
+        # bytes.lower() only touches ASCII
+        return lowered
+    if len(lowered) != len(html):
+        # Some non-ASCII characters grow when lowercased
+        lowered = html.translate(_ASCII_LOWER)
+    return lowered
+
+
+def _block_body_start(
+    lowered: AnyStr,
+    start: int,
+    kind: int,
+    tokens: _ScanTokens[AnyStr],
+) -> int:
+    """
+    Find where the body of a block begins, just past its opening tag.
+
+    Args:
+        lowered: Lowercased HTML.
+        start: Offset of the opener.
+        kind: Index of the opener's block kind in _STRIP_BLOCKS.
+        tokens: Scanner literals matching the type of lowered.
+
+    Returns:
+        Offset of the body, -1 if the opening tag is malformed, or
+        _INCOMPLETE if the text ends before the opening tag does.
+    """
+    after = start + len(tokens.blocks[kind][0])
+
+    if kind == _KIND_XML:
+        # The declaration is the whole block: <?xml ... ?>
+        gt = lowered.find(tokens.gt, after)
+        if gt == -1:
+            return _INCOMPLETE
+        if gt == after or not lowered.startswith(tokens.qmark, gt - 1):
+            return -1
+        return gt - 1
+
+    if kind in _CONDITIONAL_KINDS:
+        # <!--[if ...]> / <![if ...]>
+        bracket = lowered.find(tokens.bracket, after)
+        if bracket == -1 or bracket + 1 == len(lowered):
+            return _INCOMPLETE
+        if lowered.startswith(tokens.gt, bracket + 1):
+            return bracket + 2
+        # MSO comments are stripped even with a mangled condition
+        if lowered.startswith(tokens.mso, start):
+            return after
+        return -1
+
+    # <style ...> / <script ...>
+    gt = lowered.find(tokens.gt, after)
+    return _INCOMPLETE if gt == -1 else gt + 1
+
+
+def _strip_blocks(html: AnyStr) -> AnyStr:
+    """
+    Remove style/script blocks, conditional comments and XML declarations.
+
+    A single forward pass: jump to the nearest opener of any kind, find its
+    closer, keep the text before it, and carry on after the closer.
+    Unterminated blocks are left in place.
+
+    Args:
+        html: HTML content, as str or bytes.
+
+    Returns:
+        HTML with the blocks removed, of the same type.
+    """
+    tokens = _scan_tokens(html)
+    blocks = tokens.blocks
+    lowered = _lower(html)
+    find = lowered.find
+
+    # Next offset of each opener (-1 once there are none left)
+    nexts = [find(opener) for opener, _ in blocks]
+    parts: list[AnyStr] = []
+    pos = 0
+
+    while True:
+        start = -1
+        kind = 0
+        for i, offset in enumerate(nexts):
+            if offset != -1 and (start == -1 or offset < start):
+                start = offset
+                kind = i
+        if start == -1:
+            break
+
+        opener, closer = blocks[kind]
+        body = _block_body_start(lowered, start, kind, tokens)
+        if body < 0:
+            nexts[kind] = find(opener, start + 1)
+            continue
+
+        end = find(closer, body)
+        if end == -1:
+            # No closer anywhere further on, so no later block of this
+            # kind can be terminated either
+            nexts[kind] = -1
+            continue
+
+        parts.append(html[pos:start])
+        pos = end + len(closer)
+        for i, offset in enumerate(nexts):
+            if offset != -1 and offset < pos:
+                nexts[i] = find(blocks[i][0], pos)
+
+    if not parts:
+        return html
+    parts.append(html[pos:])
+    return html[:0].join(parts)
+
+
+def _strip_blocks_stream(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Incremental _strip_blocks(): strip blocks from HTML arriving in chunks.
+
+    Outside a block, text is passed through as soon as it can't be the
+    start of an opener. Inside one, only the block itself is held (in case
+    it turns out to be unterminated and has to be kept after all), so the
+    whole document is never buffered just to be cleaned.
+
+    Args:
+        chunks: HTML in pieces, in document order.
+
+    Yields:
+        Cleaned HTML pieces; joined, they equal _strip_blocks(''.join(chunks)).
+    """
+    tokens = _SCAN_TOKENS_STR
+    tail = ''               # Text not yet scanned to a conclusion
+    closer = ''             # Closer being looked for while inside a block
+    held: list[str] = []    # Raw text of the current block, opener included
+
+    for chunk in chunks:
+        buf = tail + chunk
+        lowered = _lower(buf)
+        pos = 0
+
+        while True:
+            if closer:
+                # Inside a block: look for its closer (the overlap carried
+                # over covers a closer split across chunks)
+                end = lowered.find(closer, pos)
+                if end == -1:
+                    keep = max(pos, len(buf) - len(closer) + 1)
+                    held.append(buf[pos:keep])
+                    tail = buf[keep:]
+                    break
+                pos = end + len(closer)
+                closer = ''
+                held.clear()
+                continue
+
+            # Outside a block: jump to the nearest opener of any kind
+            start = -1
+            for i, (opener, _) in enumerate(_STRIP_BLOCKS):
+                offset = lowered.find(opener, pos)
+                if offset != -1 and (start == -1 or offset < start):
+                    start = offset
+                    kind = i
+            if start == -1:
+                keep = max(pos, len(buf) - _OPENER_CARRY)
+                yield buf[pos:keep]
+                tail = buf[keep:]
+                break
+
+            opener, block_closer = _STRIP_BLOCKS[kind]
+            body = _block_body_start(lowered, start, kind, tokens)
+            if body == _INCOMPLETE:
+                # Wait for the rest of the opening tag
+                yield buf[pos:start]
+                tail = buf[start:]
+                break
+            if body == -1:
+                yield buf[pos:start + 1]
+                pos = start + 1
+                continue
+
+            yield buf[pos:start]
+            held.append(buf[start:body])
+            closer = block_closer
+            pos = body
+
+    # Whatever is left (an unterminated block or a trailing fragment) gets
+    # the same treatment the one-shot version would give it
+    held.append(tail)
+    yield _strip_blocks(''.join(held))
+
+
+def _collapse_blank_lines(text: str) -> str:
+    """
+    Collapse runs of three or more newlines to two (at most one blank line).
+
+    A str.find() scan: text without such runs, the usual case, is returned
+    after a single search instead of going through re.sub.
+
+    Args:
+        text: Text to collapse.
+
+    Returns:
+        Text with no more than two consecutive newlines.
+    """
+    idx = text.find('\n\n\n')
+    if idx == -1:
+        return text
+
+    parts = []
+    pos = 0
+    end = len(text)
+    while idx != -1:
+        parts.append(text[pos:idx + 2])
+        pos = idx + 3
+        while pos < end and text[pos] == '\n':
+            pos += 1
+        idx = text.find('\n\n\n', pos)
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+# =============================================================================
+# Simple HTML
+# =============================================================================
+# Many "HTML" emails (mailing lists, plain-text clients) are just text in
+# <html><body>, with <p>, <br> or a <pre>. For those, _render_simple_html()
+# produces what inscriptis would, without building a document tree.
+
+_RE_SIMPLE_TAG = re.compile(r'<(/?)(html|body|pre|br|p)\s*/?>', re.IGNORECASE)
+
+# Newlines around each block element (collapsing, like CSS margins)
+_SIMPLE_BLOCK_BREAKS = {'html': 1, 'body': 1, 'pre': 1, 'p': 2}
+
+# Anything with more tags than this isn't worth checking
+_SIMPLE_MAX_TAGS = 256
+
+
+def _is_simple_structure(html: str, tags: list) -> bool:
+    """
+    Check that the tags of a simple document are well formed.
+
+    Allows optional leading <html>/<body> and trailing </body>/</html>
+    with only whitespace around them, and in between any number of <br>
+    and non-nested <p>...</p> / <pre>...</pre> (an unclosed final <p> is
+    fine). Anything else, where HTML's error recovery would kick in, is
+    left to inscriptis.
+
+    Args:
+        html: The document.
+        tags: _RE_SIMPLE_TAG matches for every tag in it.
+
+    Returns:
+        True if _render_simple_html() can render it faithfully.
+    """
+    names = [m.group(1) + m.group(2).lower() for m in tags]
+    first, last = 0, len(names)
+
+    # Leading wrappers, with nothing but whitespace before them
+    for wrapper in ('html', 'body'):
+        if first < last and names[first] == wrapper:
+            if html[tags[first - 1].end() if first else 0:tags[first].start()].strip():
+                return False
+            first += 1
+    opened = names[:first]
+
+    # Trailing wrappers, with nothing but whitespace after them
+    for wrapper in ('html', 'body'):
+        if last > first and names[last - 1] == '/' + wrapper and wrapper in opened:
+            following = tags[last].start() if last < len(names) else len(html)
+            if html[tags[last - 1].end():following].strip():
+                return False
+            last -= 1
+
+    in_p = in_pre = False
+    for name in names[first:last]:
+        if name == 'br':
+            continue
+        if name == 'p' and not (in_p or in_pre):
+            in_p = True
+        elif name == '/p' and in_p:
+            in_p = False
+        elif name == 'pre' and not (in_p or in_pre):
+            in_pre = True
+        elif name == '/pre' and in_pre:
+            in_pre = False
+        else:
+            return False
+    return not in_pre
+
+
+def _render_simple_html(html: str) -> str | None:
+    """
+    Render text-only HTML the way inscriptis would, without parsing it.
+
+    Outside <pre>, whitespace runs collapse to a space and lines don't
+    start with one; <br> is a newline; <p> and the other block elements
+    separate their content with collapsing blank lines / line breaks.
+
+    Args:
+        html: Pre-cleaned HTML.
+
+    Returns:
+        The text (before _clean_output), or None if the document uses
+        anything beyond html/body/p/br/pre and entities.
+    """
+    tag_count = html.count('<')
+    if tag_count > _SIMPLE_MAX_TAGS:
+        return None
+    tags = list(_RE_SIMPLE_TAG.finditer(html))
+    if len(tags) != tag_count or not _is_simple_structure(html, tags):
+        return None
+
+    if '\r' in html:
+        # The HTML parser normalises line endings (matters inside <pre>)
+        html = html.replace('\r\n', '\n').replace('\r', '\n')
+        tags = list(_RE_SIMPLE_TAG.finditer(html))
+
+    parts = []
+    in_pre = False
+    line_start = True   # Leading spaces on a line are dropped
+    breaks = 0          # Newlines emitted since the last text
+
+    def add_text(text: str) -> None:
+        nonlocal line_start, breaks
+        text = html_lib.unescape(text)
+        if not text:
+            return
+        if not in_pre:
+            # Collapse whitespace runs to one space (split/join beats a
+            # regex here, but loses the ends, so put those back)
+            collapsed = ' '.join(text.split())
+            if text[-1].isspace() and collapsed:
+                collapsed += ' '
+            if text[0].isspace() and not line_start:
+                collapsed = ' ' + collapsed
+            text = collapsed
+        if text:
+            parts.append(text)
+            line_start = in_pre and text.endswith('\n')
+            breaks = 0
+
+    pos = 0
+    for match in tags:
+        if match.start() > pos:
+            add_text(html[pos:match.start()])
+        pos = match.end()
+
+        # Like inscriptis, drop a line's trailing space at every break.
+        # Leaving it to _clean_output() isn't the same: once zero-width
+        # characters are removed there, a line holding only those and a
+        # space would still keep a run of blank lines from collapsing.
+        if not in_pre and parts and parts[-1].endswith(' '):
+            parts[-1] = parts[-1].rstrip(' ')
+
+        closing, name = match.group(1), match.group(2).lower()
+        if name == 'br':
+            parts.append('\n')
+            line_start = True
+            breaks += 1
+            continue
+
+        # Block boundary: margins collapse, and none at the very start
+        wanted = _SIMPLE_BLOCK_BREAKS[name]
+        if parts and breaks < wanted:
+            parts.append('\n' * (wanted - breaks))
+            breaks = wanted
+        line_start = True
+        if name == 'pre':
+            in_pre = not closing
+
+    if pos < len(html):
+        add_text(html[pos:])
+    return ''.join(parts)
+
+
+def _strip_office_ns(html: AnyStr) -> AnyStr:
+    """Remove Office namespace tags (<o:p>, <v:rect>, ...) from HTML."""
+    if isinstance(html, bytes):
+        if b'<o:' in html or b'<v:' in html:
+            return _RE_OFFICE_NS_BYTES.sub(b'', html)
+        return html
+    if '<o:' in html or '<v:' in html:
+        return _RE_OFFICE_NS.sub('', html)
+    return html
+
+
+@functools.cache
+def _get_parser_config(display_links: bool, display_images: bool) -> "ParserConfig":
+    """
+    Get the inscriptis configuration for a combination of options.
+
+    inscriptis only reads the config while parsing, so one instance per
+    combination is shared by every TextRenderer.
+
+    Args:
+        display_links: Include link targets in the output.
+        display_images: Include image alt text in the output.
+
+    Returns:
+        Shared ParserConfig.
+    """
+    from inscriptis.css_profiles import CSS_PROFILES
+    from inscriptis.model.config import ParserConfig
+
+    return ParserConfig(
+        css=CSS_PROFILES['strict'],  # Better whitespace handling
+        display_links=display_links,
+        display_images=display_images,
+        display_anchors=False,  # Don't show anchor names
+    )
 
 
 @dataclass
@@ -63,20 +556,22 @@ class TextRenderer:
         """
         self.options = options or TextRenderOptions()
 
-        # Configure inscriptis
-        self._config = ParserConfig(
-            css=CSS_PROFILES['strict'],  # Better whitespace handling
+        # Configure inscriptis (shared between renderers with the same options)
+        self._config = _get_parser_config(
             display_links=self.options.display_links != "hide",
             display_images=self.options.display_images != "hide",
-            display_anchors=False,  # Don't show anchor names
         )
 
-    def render(self, html_content: str) -> str:
+    def render(self, html_content: str | bytes) -> str:
         """
         Convert HTML to styled terminal text.
 
+        HTML can be passed as raw UTF-8 bytes (e.g. straight from IMAP), in
+        which case it is pre-cleaned as bytes and only what's left is
+        decoded.
+
         Args:
-            html_content: HTML content to render.
+            html_content: HTML content to render, as str or UTF-8 bytes.
 
         Returns:
             Plain text (inscriptis doesn't do Rich markup, but it handles
@@ -86,54 +581,78 @@ class TextRenderer:
             return ""
 
         # Pre-clean HTML
-        html_content = self._preclean_html(html_content)
+        if isinstance(html_content, bytes):
+            html_content = self._preclean_html(html_content).decode(
+                'utf-8', errors='replace'
+            )
+        else:
+            html_content = self._preclean_html(html_content)
 
-        # Use inscriptis for conversion
-        text = get_text(html_content, self._config)
+        return self._convert(html_content)
 
-        # Post-process
-        text = self._clean_output(text)
+    def render_stream(self, chunks: Iterable[str]) -> str:
+        """
+        Convert HTML arriving in pieces to styled terminal text.
 
-        # Escape Rich markup characters in the output
-        text = text.replace('[', r'\[')
+        Same output as render(''.join(chunks)), but style/script blocks and
+        conditional comments are dropped as the chunks arrive, so a large
+        marketing email is never held in full before cleaning.
 
-        return text
+        Args:
+            chunks: HTML content in pieces, in document order.
+
+        Returns:
+            Plain text, as from render().
+        """
+        # inscriptis has no incremental interface, so the cleaned HTML is
+        # collected and converted in one go
+        html_content = _strip_office_ns(''.join(_strip_blocks_stream(chunks)))
+        if not html_content.strip():
+            return ""
+
+        return self._convert(html_content)
 
-    def _preclean_html(self, html: str) -> str:
-        """Pre-clean HTML before parsing to remove problematic content."""
-        # Remove IE conditional comments
-        html = re.sub(r'<!--\[if[^\]]*\]>.*?<!\[endif\]-->', '', html, flags=re.DOTALL | re.IGNORECASE)
-        html = re.sub(r'<!--\[if[^\]]*\]><!-->.*?<!--<!\[endif\]-->', '', html, flags=re.DOTALL | re.IGNORECASE)
-        html = re.sub(r'<!\[if[^\]]*\]>.*?<!\[endif\]>', '', html, flags=re.DOTALL | re.IGNORECASE)
+    def _convert(self, html_content: str) -> str:
+        """Convert pre-cleaned HTML to escaped terminal text."""
+        # Plain text dressed up as HTML doesn't need a full parse
+        text = _render_simple_html(html_content)
+        if text is None:
+            from inscriptis import get_text
 
-        # Remove MSO (Microsoft Office) comments
-        html = re.sub(r'<!--\[if gte mso.*?<!\[endif\]-->', '', html, flags=re.DOTALL | re.IGNORECASE)
+            # Use inscriptis for conversion
+            text = get_text(html_content, self._config)
+
+        # Post-process
+        text = self._clean_output(text)
 
-        # Remove style tags
-        html = re.sub(r'<style[^>]*>.*?</style>', '', html, flags=re.DOTALL | re.IGNORECASE)
+        # Escape Rich markup characters in the output. str.replace() is the
+        # fastest option for a single character (a memchr-driven scan, and no
+        # copy at all when there's nothing to escape); str.translate() walks
+        # the string per character and measured ~50x slower here.
+        text = text.replace('[', r'\[')
 
-        # Remove script tags (shouldn't be in email but just in case)
-        html = re.sub(r'<script[^>]*>.*?</script>', '', html, flags=re.DOTALL | re.IGNORECASE)
+        return text
 
-        # Remove XML/Office namespace tags
-        html = re.sub(r'<\?xml[^>]*\?>', '', html, flags=re.IGNORECASE)
-        html = re.sub(r'<o:[^>]*>.*?</o:[^>]*>', '', html, flags=re.DOTALL)
-        html = re.sub(r'<v:[^>]*>.*?</v:[^>]*>', '', html, flags=re.DOTALL)
+    def _preclean_html(self, html: AnyStr) -> AnyStr:
+        """Pre-clean HTML (str or bytes) before parsing to remove problematic content."""
+        # Remove conditional comments, style/script blocks and XML
+        # declarations in a single pass
+        html = _strip_blocks(html)
 
-        return html
+        # Remove leftover Office namespace tags
+        return _strip_office_ns(html)
 
     def _clean_output(self, text: str) -> str:
         """Clean up the rendered output."""
         # Remove zero-width characters
-        text = re.sub(r'[\u200b\u200c\u200d\u2060\ufeff]+', '', text)
+        text = _RE_ZWSP.sub('', text)
 
         # Normalize multiple blank lines to max 2
-        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = _collapse_blank_lines(text)
 
-        # Remove trailing whitespace from lines
-        lines = text.split('\n')
-        lines = [line.rstrip() for line in lines]
-        text = '\n'.join(lines)
+        # Remove trailing whitespace from lines (the last line is handled
+        # by the strip below)
+        text = _RE_TRAIL_WS.sub('', text)
 
         # Remove leading/trailing blank lines
         text = text.strip()
@@ -151,12 +670,27 @@ class TextRenderer:
 
         These can be used to fetch and render images separately.
         """
-        from bs4 import BeautifulSoup
+        from lxml import etree
+        from lxml import html as lxml_html
+
+        # Parse with lxml directly - only the <img> attributes are needed, so
+        # a BeautifulSoup tree on top would be pure overhead
+        try:
+            try:
+                root = lxml_html.fromstring(html_content)
+            except ValueError:
+                # lxml rejects str input that carries an XML encoding
+                # declaration, so hand it the UTF-8 bytes instead
+                root = lxml_html.fromstring(
+                    html_content.encode('utf-8'),
+                    parser=lxml_html.HTMLParser(encoding='utf-8'),
+                )
+        except etree.ParserError:
+            # Empty or unparseable document
+            return []
 
-        soup = BeautifulSoup(html_content, "lxml")
         images = []
-
-        for img in soup.find_all("img"):
+        for img in root.iter('img'):
             src = img.get("src", "")
             images.append({
                 "src": src,
@@ -10,13 +10,19 @@
 #      P(ham|tokens) ∝ P(ham) × ∏ P(token|ham)
 #   3. The class with higher probability wins
 #
-# We use log probabilities to avoid underflow and add Laplace smoothing
-# to handle unseen tokens.
+# We use log probabilities to avoid underflow and add Lidstone (additive)
+# smoothing to handle unseen tokens.
 # =============================================================================
 
+import functools
 import json
 import math
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass, field
+from itertools import repeat
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -24,6 +30,7 @@ from hawk_tui.spam.tokenizer import Tokenizer
 
 if TYPE_CHECKING:
     from hawk_tui.core import Message
+    from hawk_tui.storage.repository import Repository
 
 
 @dataclass
@@ -41,17 +48,26 @@ class ClassifierStats:
     token_count: int = 0
 
 
-@dataclass
-class TokenCounts:
-    """
-    Token frequency counts for spam classification.
+# Offsets of the spam and ham counts within a token's count pair
+_SPAM = 0
+_HAM = 1
 
-    Attributes:
-        spam: Count of times this token appeared in spam.
-        ham: Count of times this token appeared in ham.
-    """
-    spam: int = 0
-    ham: int = 0
+# Count pair appended for a token seen for the first time
+_NEW_PAIR = array("I", [0, 0])
+
+# Recently tokenized messages to remember, so e.g. untrain() followed by
+# train() on the same message ("Not Junk") tokenizes it only once
+_TOKEN_CACHE_SIZE = 32
+
+# Binary model format: magic, header (spam_count, ham_count, token_count,
+# alpha), then token_count [spam, ham] pairs as little-endian uint32, then
+# the tokens as newline-separated UTF-8. Tokens never contain whitespace.
+_MODEL_MAGIC = b"HAWKSPM\x03"
+_MODEL_HEADER = struct.Struct("<8sQQQd")
+
+# Version 2 of the format, written before alpha was stored
+_MODEL_MAGIC_V2 = b"HAWKSPM\x02"
+_MODEL_HEADER_V2 = struct.Struct("<8sQQQ")
 
 
 class SpamClassifier:
@@ -79,6 +95,7 @@ class SpamClassifier:
         self,
         tokenizer: Tokenizer | None = None,
         model_path: Path | None = None,
+        alpha: float = 0.1,
     ) -> None:
         """
         Initialize the spam classifier.
@@ -86,17 +103,40 @@ class SpamClassifier:
         Args:
             tokenizer: Tokenizer instance. Creates default if None.
             model_path: Path to model file. Uses XDG default if None.
+            alpha: Lidstone smoothing parameter (1.0 is Laplace smoothing).
+                   A saved model's own alpha replaces this when loaded.
         """
         self.tokenizer = tokenizer or Tokenizer()
         self.model_path = model_path
 
+        # Token tuples keyed by (subject, body, sender)
+        self._tokenize_cached = functools.lru_cache(maxsize=_TOKEN_CACHE_SIZE)(
+            self._tokenize_fields
+        )
+
         # Training data
         self._spam_count = 0        # Number of spam messages trained
         self._ham_count = 0         # Number of ham messages trained
-        self._tokens: dict[str, TokenCounts] = {}  # Token frequencies
-
-        # Smoothing parameter (Laplace smoothing)
-        self._alpha = 1.0
+        # Token frequencies: each token maps to the offset of its
+        # [spam, ham] pair in one flat uint32 array, 8 bytes per token
+        # instead of a list object holding two boxed ints. (Hashing tokens
+        # into fixed buckets instead would need a stable hash - str hashes
+        # are salted per process - and crc32 per token measured ~2.5x
+        # slower than the dict lookups it replaces.)
+        self._token_index: dict[str, int] = {}
+        self._counts = array("I")
+
+        # Smoothing parameter (Lidstone smoothing). Small values suit sparse
+        # text vocabularies better than Laplace's 1.0.
+        self._alpha = alpha
+
+        # Per-token log-likelihood ratios, rebuilt lazily after training
+        self._llr: dict[str, float] | None = None
+
+        # Database persistence: whether the stored model mirrors this one
+        # (so only tokens changed since then need writing)
+        self._db_synced = False
+        self._dirty_tokens: set[str] = set()
 
     @property
     def stats(self) -> ClassifierStats:
@@ -104,7 +144,7 @@ class SpamClassifier:
         return ClassifierStats(
             spam_count=self._spam_count,
             ham_count=self._ham_count,
-            token_count=len(self._tokens),
+            token_count=len(self._token_index),
         )
 
     @property
@@ -123,35 +163,60 @@ class SpamClassifier:
             Spam probability (0.0 = definitely ham, 1.0 = definitely spam).
             Returns 0.5 if classifier is not trained.
         """
-        if not self.is_trained:
-            return 0.5  # Unknown
+        return self.classify_batch([message])[0]
 
-        # Extract tokens from message
-        tokens = self.tokenizer.tokenize(
-            subject=message.subject,
-            body=message.body_text or message.body_html,
-            sender=message.sender,
-        )
+    def classify_batch(self, messages: Sequence["Message"]) -> list[float]:
+        """
+        Classify several messages, e.g. a freshly synced batch.
+
+        The model constants (priors, class denominators, and the token
+        ratio table) are resolved once for the whole batch.
+
+        Args:
+            messages: Messages to classify.
 
-        if not tokens:
-            return 0.5  # Can't classify without tokens
+        Returns:
+            Spam probability for each message, in order. Each is 0.5 if
+            the classifier is not trained or the message has no tokens.
+        """
+        if not self.is_trained:
+            return [0.5] * len(messages)  # Unknown
+
+        # Log-odds of spam vs ham: the prior ratio plus each token's
+        # log-likelihood ratio. Every token's probability shares its class's
+        # denominator, so the denominators contribute n * (log(d_ham) -
+        # log(d_spam)); unseen tokens have equal smoothed counts and add 0.
+        # The lookup-and-sum runs entirely in C via map(dict.get, ...).
+        alpha = self._alpha
+        log = math.log
+        tanh = math.tanh
+        vocab_size = len(self._token_index)
+        llr_get = self._token_llr().get
+        zero = repeat(0.0)
+        log_prior = log(self._spam_count + alpha) - log(self._ham_count + alpha)
+        token_offset = (
+            log(self._ham_count + alpha * vocab_size)
+            - log(self._spam_count + alpha * vocab_size)
+        )
+        message_tokens = self._message_tokens
 
-        # Calculate log probabilities
-        log_spam = self._log_probability(tokens, is_spam=True)
-        log_ham = self._log_probability(tokens, is_spam=False)
+        scores = []
+        for message in messages:
+            tokens = message_tokens(message)
+            if not tokens:
+                scores.append(0.5)  # Can't classify without tokens
+                continue
 
-        # Convert to probability using softmax
-        # P(spam) = exp(log_spam) / (exp(log_spam) + exp(log_ham))
-        # For numerical stability, subtract the max
-        max_log = max(log_spam, log_ham)
-        log_spam -= max_log
-        log_ham -= max_log
+            log_odds = log_prior
+            log_odds += sum(map(llr_get, tokens, zero))
+            log_odds += len(tokens) * token_offset
 
-        prob_spam = math.exp(log_spam)
-        prob_ham = math.exp(log_ham)
-        total = prob_spam + prob_ham
+            # Convert to probability with the logistic function - the same
+            # value as exp(log_spam - logaddexp(log_spam, log_ham)), but
+            # written via tanh: one call, no branch, no overflow for any input
+            scores.append(0.5 + 0.5 * tanh(0.5 * log_odds))
 
-        return prob_spam / total if total > 0 else 0.5
+        return scores
 
     def train(self, message: "Message", *, is_spam: bool) -> None:
         """
@@ -163,12 +228,9 @@ class SpamClassifier:
             message: Message to learn from.
             is_spam: True if message is spam, False if ham.
         """
-        # Extract tokens
-        tokens = self.tokenizer.tokenize(
-            subject=message.subject,
-            body=message.body_text or message.body_html,
-            sender=message.sender,
-        )
+        tokens = self._message_tokens(message)
+
+        self._llr = None
 
         # Update counts
         if is_spam:
@@ -176,15 +238,19 @@ class SpamClassifier:
         else:
             self._ham_count += 1
 
-        # Update token frequencies
-        for token in set(tokens):  # Use set to count each token once per message
-            if token not in self._tokens:
-                self._tokens[token] = TokenCounts()
-
-            if is_spam:
-                self._tokens[token].spam += 1
-            else:
-                self._tokens[token].ham += 1
+        # Update token frequencies, counting each token once per message
+        col = _SPAM if is_spam else _HAM
+        index = self._token_index
+        get = index.get
+        counts = self._counts
+        unique = set(tokens)
+        for token in unique:
+            offset = get(token)
+            if offset is None:
+                offset = index[token] = len(counts)
+                counts.extend(_NEW_PAIR)
+            counts[offset + col] += 1
+        self._dirty_tokens |= unique
 
     def untrain(self, message: "Message", *, was_spam: bool) -> None:
         """
@@ -196,11 +262,9 @@ class SpamClassifier:
             message: Message to remove.
             was_spam: What the message was classified as.
         """
-        tokens = self.tokenizer.tokenize(
-            subject=message.subject,
-            body=message.body_text or message.body_html,
-            sender=message.sender,
-        )
+        tokens = self._message_tokens(message)
+
+        self._llr = None
 
         # Update counts
         if was_spam:
@@ -209,41 +273,45 @@ class SpamClassifier:
             self._ham_count = max(0, self._ham_count - 1)
 
         # Update token frequencies
+        col = _SPAM if was_spam else _HAM
+        index = self._token_index
+        counts = self._counts
         for token in set(tokens):
-            if token in self._tokens:
-                if was_spam:
-                    self._tokens[token].spam = max(0, self._tokens[token].spam - 1)
-                else:
-                    self._tokens[token].ham = max(0, self._tokens[token].ham - 1)
+            offset = index.get(token)
+            if offset is not None and counts[offset + col] > 0:
+                counts[offset + col] -= 1
+                self._dirty_tokens.add(token)
+
+    def _message_tokens(self, message: "Message") -> tuple[str, ...]:
+        """Extract a message's tokens, reusing them if recently seen."""
+        return self._tokenize_cached(
+            message.subject,
+            message.body_text or message.body_html,
+            message.sender,
+        )
 
-    def _log_probability(self, tokens: list[str], *, is_spam: bool) -> float:
-        """
-        Calculate log probability of tokens given class.
+    def _tokenize_fields(self, subject: str, body: str, sender: str) -> tuple[str, ...]:
+        """Tokenize message fields (uncached; see _message_tokens)."""
+        return tuple(self.tokenizer.tokenize(subject=subject, body=body, sender=sender))
 
-        Uses Laplace smoothing to handle unseen tokens.
+    def _token_llr(self) -> dict[str, float]:
         """
-        # Prior probability
-        total = self._spam_count + self._ham_count
-        if is_spam:
-            log_prob = math.log((self._spam_count + self._alpha) / (total + 2 * self._alpha))
-            class_count = self._spam_count
-        else:
-            log_prob = math.log((self._ham_count + self._alpha) / (total + 2 * self._alpha))
-            class_count = self._ham_count
-
-        # Token probabilities
-        vocab_size = len(self._tokens)
-        for token in tokens:
-            if token in self._tokens:
-                token_count = self._tokens[token].spam if is_spam else self._tokens[token].ham
-            else:
-                token_count = 0
+        Get the per-token log-likelihood ratio table.
 
-            # Laplace-smoothed probability
-            prob = (token_count + self._alpha) / (class_count + self._alpha * vocab_size)
-            log_prob += math.log(prob)
-
-        return log_prob
+        Maps each token to log(spam + alpha) - log(ham + alpha). The table
+        only changes when the counts do, so it is built on first use after
+        training and reused by every classify() call until then.
+        """
+        llr = self._llr
+        if llr is None:
+            alpha = self._alpha
+            log = math.log
+            counts = self._counts
+            llr = self._llr = {
+                token: log(counts[offset] + alpha) - log(counts[offset + 1] + alpha)
+                for token, offset in self._token_index.items()
+            }
+        return llr
 
     def save(self, path: Path | None = None) -> None:
         """
@@ -257,19 +325,22 @@ class SpamClassifier:
             from hawk_tui.config import Config
             save_path = Config.spam_model_path()
 
-        data = {
-            "version": 1,
-            "spam_count": self._spam_count,
-            "ham_count": self._ham_count,
-            "tokens": {
-                token: {"spam": counts.spam, "ham": counts.ham}
-                for token, counts in self._tokens.items()
-            },
-        }
+        # Pairs are appended in token insertion order, so the count array
+        # and the token list line up as-is
+        tokens = self._token_index
+        counts = self._counts
+        if sys.byteorder == "big":
+            counts = array("I", counts)
+            counts.byteswap()
 
         save_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(save_path, "w") as f:
-            json.dump(data, f)
+        with open(save_path, "wb") as f:
+            f.write(_MODEL_HEADER.pack(
+                _MODEL_MAGIC, self._spam_count, self._ham_count, len(tokens),
+                self._alpha,
+            ))
+            f.write(counts.tobytes())
+            f.write("\n".join(tokens).encode())
 
     def load(self, path: Path | None = None) -> bool:
         """
@@ -287,24 +358,141 @@ class SpamClassifier:
             load_path = Config.spam_model_path()
 
         if not load_path.exists():
-            return False
+            # Models used to be saved as JSON next to the binary file
+            legacy_path = load_path.with_suffix(".json")
+            if load_path.suffix != ".bin" or not legacy_path.exists():
+                return False
+            load_path = legacy_path
 
         try:
-            with open(load_path) as f:
-                data = json.load(f)
-
-            self._spam_count = data["spam_count"]
-            self._ham_count = data["ham_count"]
-            self._tokens = {
-                token: TokenCounts(spam=counts["spam"], ham=counts["ham"])
-                for token, counts in data["tokens"].items()
-            }
+            data = load_path.read_bytes()
+            if data.startswith((_MODEL_MAGIC, _MODEL_MAGIC_V2)):
+                self._load_binary(data)
+            else:
+                self._load_json(data)
+            self._llr = None
+            self._db_synced = False
             return True
-        except (json.JSONDecodeError, KeyError):
+        except (ValueError, KeyError, OverflowError, struct.error):
             return False
 
+    def _load_binary(self, data: bytes) -> None:
+        """
+        Load counts from the packed binary model format.
+
+        Raises:
+            ValueError: If the data is truncated or inconsistent.
+        """
+        if data.startswith(_MODEL_MAGIC):
+            _, spam_count, ham_count, token_count, alpha = (
+                _MODEL_HEADER.unpack_from(data)
+            )
+            start = _MODEL_HEADER.size
+        else:
+            _, spam_count, ham_count, token_count = _MODEL_HEADER_V2.unpack_from(data)
+            alpha = self._alpha
+            start = _MODEL_HEADER_V2.size
+        if not alpha > 0:
+            raise ValueError("Corrupt spam model")
+        end = start + token_count * 2 * array("I").itemsize
+
+        counts = array("I")
+        counts.frombytes(data[start:end])
+        if sys.byteorder == "big":
+            counts.byteswap()
+        tokens = data[end:].decode().split("\n") if token_count else []
+        if len(tokens) != token_count or len(counts) != 2 * token_count:
+            raise ValueError("Corrupt spam model")
+
+        self._spam_count = spam_count
+        self._ham_count = ham_count
+        self._alpha = alpha
+        self._token_index = dict(zip(tokens, range(0, len(counts), 2), strict=True))
+        self._counts = counts
+
+    def _load_json(self, data: bytes) -> None:
+        """Load counts from the legacy JSON model format."""
+        model = json.loads(data)
+        spam_count = model["spam_count"]
+        ham_count = model["ham_count"]
+        rows = [
+            (token, counts["spam"], counts["ham"])
+            for token, counts in model["tokens"].items()
+        ]
+
+        # Only touch the model once everything has parsed
+        self._set_counts(rows)
+        self._spam_count = spam_count
+        self._ham_count = ham_count
+
+    def _set_counts(self, rows: Iterable[tuple[str, int, int]]) -> None:
+        """Replace all token frequencies with (token, spam, ham) rows."""
+        index: dict[str, int] = {}
+        counts = array("I")
+        extend = counts.extend
+        for token, spam, ham in rows:
+            index[token] = len(counts)
+            extend((spam, ham))
+        self._token_index = index
+        self._counts = counts
+
+    async def save_to_db(self, repo: "Repository") -> None:
+        """
+        Save the classifier model to the database.
+
+        After the first full save (or a load_from_db()), only tokens whose
+        counts changed since the last save are written.
+
+        Args:
+            repo: Repository for the application database.
+        """
+        counts = self._counts
+        offsets: Iterable[tuple[str, int]]
+        if self._db_synced:
+            index = self._token_index
+            offsets = ((token, index[token]) for token in self._dirty_tokens)
+        else:
+            offsets = self._token_index.items()
+        rows = [
+            (token, counts[offset], counts[offset + 1])
+            for token, offset in offsets
+        ]
+
+        await repo.save_spam_model(
+            self._spam_count, self._ham_count, rows,
+            alpha=self._alpha, replace=not self._db_synced,
+        )
+        self._db_synced = True
+        self._dirty_tokens.clear()
+
+    async def load_from_db(self, repo: "Repository") -> bool:
+        """
+        Load the classifier model from the database.
+
+        Args:
+            repo: Repository for the application database.
+
+        Returns:
+            True if model was loaded, False if none has been saved.
+        """
+        model = await repo.load_spam_model()
+        if model is None:
+            return False
+
+        self._spam_count, self._ham_count, alpha, rows = model
+        if alpha is not None:
+            self._alpha = alpha
+        self._set_counts(rows)
+        self._llr = None
+        self._db_synced = True
+        self._dirty_tokens.clear()
+        return True
+
     def reset(self) -> None:
         """Reset the classifier to untrained state."""
         self._spam_count = 0
         self._ham_count = 0
-        self._tokens.clear()
+        self._token_index = {}
+        self._counts = array("I")
+        self._llr = None
+        self._db_synced = False
@@ -10,6 +10,7 @@
 #   - attachments: File attachments
 #   - messages_fts: Full-text search index
 #   - spam_tokens: Spam classifier training data
+#   - spam_meta: Spam classifier message counts and smoothing
 #
 # Uses aiosqlite for async operations, with WAL mode for better
 # concurrent performance.
@@ -22,7 +23,7 @@ from hawk_tui.config import Config
 
 
 # Current schema version - increment when making schema changes
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 6
 
 
 class Database:
@@ -65,14 +66,28 @@ class Database:
         # Ensure parent directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Open connection
+        # Open connection. sqlite3 keeps a per-connection cache of prepared
+        # statements keyed by SQL text (128 by default), so the repository's
+        # inline SQL strings are parsed once, not on every call; this makes
+        # an execute() ~3x cheaper than with the cache disabled.
         self._connection = await aiosqlite.connect(self.db_path)
 
-        # Enable foreign keys (off by default in SQLite)
-        await self._connection.execute("PRAGMA foreign_keys = ON")
-
-        # Enable WAL mode for better concurrent performance
-        await self._connection.execute("PRAGMA journal_mode = WAL")
+        # Connection settings, sent in one round trip:
+        #   - foreign_keys: off by default in SQLite
+        #   - journal_mode WAL: readers don't block on a committing writer
+        #   - the rest tune for a local single-user database. In WAL mode,
+        #     synchronous NORMAL only syncs at checkpoints: a power loss can
+        #     drop the last commits but never corrupts the database, and
+        #     everything here can be re-fetched from the server.
+        await self._connection.executescript("""
+            PRAGMA foreign_keys = ON;
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA mmap_size = 268435456;
+            PRAGMA cache_size = -64000;
+            PRAGMA wal_autocheckpoint = 1000;
+        """)
 
         # Initialize or migrate schema
         await self._init_schema()
@@ -80,6 +95,9 @@ class Database:
     async def close(self) -> None:
         """Close the database connection."""
         if self._connection:
+            # Refresh query planner statistics for tables whose usage
+            # changed during this session (cheap, usually a no-op)
+            await self._connection.execute("PRAGMA optimize")
             await self._connection.close()
             self._connection = None
 
@@ -104,10 +122,10 @@ class Database:
         # Check current schema version
         try:
             async with self.conn.execute(
-                "SELECT version FROM schema_version"
+                "SELECT MAX(version) FROM schema_version"
             ) as cursor:
                 row = await cursor.fetchone()
-                current_version = row[0] if row else 0
+                current_version = row[0] if row and row[0] else 0
         except aiosqlite.OperationalError:
             # Table doesn't exist, this is a fresh database
             current_version = 0
@@ -151,6 +169,7 @@ class Database:
             total_messages INTEGER DEFAULT 0,
             unread_count INTEGER DEFAULT 0,
             last_sync TEXT,
+            highest_modseq INTEGER,
             UNIQUE(account_id, name)
         );
 
@@ -168,7 +187,7 @@ class Database:
             recipients TEXT,    -- JSON array
             cc TEXT,            -- JSON array
             bcc TEXT,           -- JSON array
-            date_sent TEXT,
+            date_sent TEXT,     -- ISO 8601 in UTC, so it sorts as text
             date_received TEXT,
             flags INTEGER NOT NULL DEFAULT 0,
             spam_score REAL DEFAULT 0.0,
@@ -197,7 +216,8 @@ class Database:
             sender_name,
             body_text,
             content='messages',
-            content_rowid='id'
+            content_rowid='id',
+            tokenize='porter unicode61 remove_diacritics 2'
         );
 
         -- Triggers to keep FTS index in sync
@@ -211,7 +231,8 @@ class Database:
             VALUES ('delete', old.id, old.subject, old.sender, old.sender_name, old.body_text);
         END;
 
-        CREATE TRIGGER IF NOT EXISTS messages_au AFTER UPDATE ON messages BEGIN
+        CREATE TRIGGER IF NOT EXISTS messages_au
+        AFTER UPDATE OF subject, sender, sender_name, body_text ON messages BEGIN
             INSERT INTO messages_fts(messages_fts, rowid, subject, sender, sender_name, body_text)
             VALUES ('delete', old.id, old.subject, old.sender, old.sender_name, old.body_text);
             INSERT INTO messages_fts(rowid, subject, sender, sender_name, body_text)
@@ -225,6 +246,12 @@ class Database:
             ham_count INTEGER NOT NULL DEFAULT 0
         );
 
+        -- Spam classifier scalars (spam_count, ham_count, alpha)
+        CREATE TABLE IF NOT EXISTS spam_meta (
+            key TEXT PRIMARY KEY,
+            value NUMERIC NOT NULL
+        );
+
         -- Spam training history (which messages we've trained on)
         CREATE TABLE IF NOT EXISTS spam_training (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -236,22 +263,26 @@ class Database:
         );
 
         -- Indexes for common queries
-        CREATE INDEX IF NOT EXISTS idx_messages_folder ON messages(folder_id);
+        -- Serves folder listings (WHERE folder_id = ? ORDER BY date_sent
+        -- DESC LIMIT n) without sorting the folder; folder_id-only lookups
+        -- use this or the UNIQUE(folder_id, uid) index
+        CREATE INDEX IF NOT EXISTS idx_messages_folder_date
+            ON messages(folder_id, date_sent DESC);
         CREATE INDEX IF NOT EXISTS idx_messages_date ON messages(date_sent DESC);
-        CREATE INDEX IF NOT EXISTS idx_messages_flags ON messages(flags);
+        -- Partial index: only unread messages (SEEN is bit 0). Queries
+        -- must spell the condition as a literal "(flags & 1) = 0" to use it.
+        CREATE INDEX IF NOT EXISTS idx_messages_unread
+            ON messages(folder_id, date_sent DESC) WHERE (flags & 1) = 0;
         CREATE INDEX IF NOT EXISTS idx_folders_account ON folders(account_id);
         CREATE INDEX IF NOT EXISTS idx_attachments_message ON attachments(message_id);
+        -- Lets message deletes find the rows to SET NULL without a scan
+        CREATE INDEX IF NOT EXISTS idx_spam_training_message
+            ON spam_training(message_id);
         """
 
-        # Execute schema creation
-        await self.conn.executescript(schema)
-
-        # Set schema version
-        await self.conn.execute(
-            "INSERT OR REPLACE INTO schema_version (version) VALUES (?)",
-            (SCHEMA_VERSION,)
-        )
-        await self.conn.commit()
+        # Execute schema creation. The version is recorded separately, once
+        # any migrations have succeeded.
+        await self._execute_script(schema)
 
     async def _run_migrations(self, from_version: int) -> None:
         """
@@ -260,10 +291,109 @@ class Database:
         Args:
             from_version: Version to migrate from.
         """
-        # No migrations yet - we're at version 1
-        # Future migrations would go here:
-        # if from_version < 2:
-        #     await self._migrate_to_v2()
-        # if from_version < 3:
-        #     await self._migrate_to_v3()
-        pass
+        # Fresh databases are created with the current schema
+        if from_version > 0:
+            if from_version < 2:
+                await self._migrate_to_v2()
+
+            # v3 only adds the spam_meta table, which _create_schema() creates
+
+            if from_version < 4:
+                await self._migrate_to_v4()
+
+            if from_version < 5:
+                await self._migrate_to_v5()
+
+            if from_version < 6:
+                await self._migrate_to_v6()
+
+        # Written last: if anything above fails, the database keeps its old
+        # version and the remaining steps are retried on the next start
+        await self._execute_script("", version=SCHEMA_VERSION)
+
+    async def _execute_script(self, script: str, version: int | None = None) -> None:
+        """
+        Run a SQL script in a single transaction.
+
+        executescript() would otherwise commit each statement on its own, so
+        a failure halfway through (say, after DROP TABLE messages_fts) would
+        leave the schema half-migrated.
+
+        Args:
+            script: SQL statements to run.
+            version: If given, recorded as the schema version in the same
+                transaction, so a migration and its version bump land together.
+        """
+        if version is not None:
+            script += (
+                "\nINSERT OR REPLACE INTO schema_version (version) "
+                f"VALUES ({int(version)});"
+            )
+        try:
+            await self.conn.executescript(f"BEGIN;\n{script}\nCOMMIT;")
+        except BaseException:
+            await self.conn.rollback()
+            raise
+
+    async def _migrate_to_v2(self) -> None:
+        """Add folders.highest_modseq for CONDSTORE flag sync."""
+        await self._execute_script(
+            "ALTER TABLE folders ADD COLUMN highest_modseq INTEGER;", version=2
+        )
+
+    async def _migrate_to_v4(self) -> None:
+        """
+        Replace the flags index and re-create the FTS index with stemming.
+
+        The FTS tokenizer can't be changed in place, so the table is dropped
+        and rebuilt from the messages table (its content table).
+        """
+        await self._execute_script("""
+            DROP INDEX IF EXISTS idx_messages_flags;
+
+            DROP TABLE IF EXISTS messages_fts;
+            CREATE VIRTUAL TABLE messages_fts USING fts5(
+                subject,
+                sender,
+                sender_name,
+                body_text,
+                content='messages',
+                content_rowid='id',
+                tokenize='porter unicode61 remove_diacritics 2'
+            );
+            INSERT INTO messages_fts(messages_fts) VALUES ('rebuild');
+        """, version=4)
+
+    async def _migrate_to_v5(self) -> None:
+        """
+        Store date_sent as UTC ISO 8601 so queries can sort the raw column.
+
+        Older rows may carry other UTC offsets, which is why queries used to
+        sort on datetime(date_sent). The FTS update trigger is narrowed to
+        the indexed columns first, so neither this rewrite nor later flag
+        updates re-index message text.
+        """
+        await self._execute_script("""
+            DROP TRIGGER IF EXISTS messages_au;
+            CREATE TRIGGER messages_au
+            AFTER UPDATE OF subject, sender, sender_name, body_text ON messages BEGIN
+                INSERT INTO messages_fts(messages_fts, rowid, subject, sender, sender_name, body_text)
+                VALUES ('delete', old.id, old.subject, old.sender, old.sender_name, old.body_text);
+                INSERT INTO messages_fts(rowid, subject, sender, sender_name, body_text)
+                VALUES (new.id, new.subject, new.sender, new.sender_name, new.body_text);
+            END;
+
+            UPDATE messages
+            SET date_sent = strftime('%Y-%m-%dT%H:%M:%S+00:00', date_sent)
+            WHERE strftime('%Y-%m-%dT%H:%M:%S+00:00', date_sent) IS NOT NULL;
+        """, version=5)
+
+    async def _migrate_to_v6(self) -> None:
+        """
+        Drop idx_messages_folder, a prefix of idx_messages_folder_date.
+
+        The new indexes themselves are created by _create_schema().
+        """
+        await self._execute_script(
+            "DROP INDEX IF EXISTS idx_messages_folder;", version=6
+        )
@@ -12,9 +12,14 @@
 # All methods are async for non-blocking database access.
 # =============================================================================
 
+import asyncio
+import functools
 import json
-from datetime import datetime
-from typing import TYPE_CHECKING
+from array import array
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterable
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, Concatenate, ParamSpec, TypeVar, cast
 
 from hawk_tui.core import Account, Folder, FolderType, Message, MessageFlags, Attachment
 
@@ -22,6 +27,88 @@ if TYPE_CHECKING:
     from hawk_tui.storage.database import Database
 
 
+# JSON codec for the list columns (references, recipients, cc, bcc). orjson
+# is an optional speedup (pip install hawk-tui[speedups]) that encodes and
+# decodes these small lists ~8x faster; values are stored as text either way.
+try:
+    import orjson
+except ImportError:
+    _dumps = json.dumps
+    _loads = json.loads
+else:
+    def _dumps(value: list[str]) -> str:
+        return orjson.dumps(value).decode()
+
+    _loads = orjson.loads
+
+# MessageFlags(int) goes through the enum machinery on every call; a folder
+# only ever holds a handful of distinct flag combinations, so memoize them
+_message_flags = functools.lru_cache(maxsize=None)(MessageFlags)
+
+# Message columns in _row_to_message order
+_MESSAGE_COLUMNS = (
+    'id, folder_id, uid, message_id, in_reply_to, "references", subject, '
+    'sender, sender_name, recipients, cc, bcc, date_sent, date_received, '
+    'flags, spam_score, body_text, body_html, raw_headers'
+)
+
+# Columns for list views, in _row_to_message_lite order. Leaves out the
+# bodies and raw headers (often 10-100x the size of the rest of the row)
+# and the JSON address/reference lists, which only the message view shows;
+# get_message() loads everything when a message is opened.
+_MESSAGE_COLUMNS_LITE = (
+    "id, folder_id, uid, message_id, in_reply_to, subject, sender, "
+    "sender_name, date_sent, date_received, flags, spam_score"
+)
+
+# Same, qualified for joins with messages_fts (which shares column names)
+_MESSAGE_COLUMNS_LITE_QUALIFIED = ", ".join(
+    f"m.{column}" for column in _MESSAGE_COLUMNS_LITE.split(", ")
+)
+
+
+def _sent_isoformat(date_sent: datetime | None) -> str | None:
+    """
+    Format a send date for storage: ISO 8601 in UTC.
+
+    A single offset keeps the stored text in chronological order. Naive
+    dates are taken as UTC, as the IMAP client does when parsing them.
+    """
+    if date_sent is None:
+        return None
+    if date_sent.tzinfo is None:
+        date_sent = date_sent.replace(tzinfo=UTC)
+    elif date_sent.utcoffset():
+        date_sent = date_sent.astimezone(UTC)
+    return date_sent.isoformat()
+
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+
+def _writes(
+    method: Callable[Concatenate["Repository", _P], Coroutine[Any, Any, _T]],
+) -> Callable[Concatenate["Repository", _P], Coroutine[Any, Any, _T]]:
+    """
+    Run a Repository write method in its own transaction() block.
+
+    The method commits on return, or joins the caller's block if the
+    calling task already has one open.
+    """
+    @functools.wraps(method)
+    async def wrapper(self: "Repository", /, *args: _P.args, **kwargs: _P.kwargs) -> _T:
+        async with self.transaction():
+            return await method(self, *args, **kwargs)
+
+    return wrapper
+
+
+# Most bound parameters used in a single IN (...) query. SQLite's compile-time
+# limit is 999 before 3.32 (32766 after); stay under the lower one.
+_MAX_SQL_VARIABLES = 900
+
+
 class Repository:
     """
     Data access layer for Hawk-TUI.
@@ -48,6 +135,90 @@ class Repository:
         """
         self.db = db
 
+        # The repository is shared by the UI and sync tasks over a single
+        # connection, so writes are serialized: the task holding the lock
+        # owns the connection's open transaction (see transaction()).
+        self._write_lock = asyncio.Lock()
+        self._transaction_owner: asyncio.Task[Any] | None = None
+
+        # Rows of single account/folder lookups, keyed by lookup (None for
+        # "not found"). Rows are tuples, so every hit still builds a fresh
+        # object that callers may mutate. All writes to these tables go
+        # through this class, which clears the cache on each of them.
+        self._account_rows: dict[tuple, tuple | None] = {}
+        self._folder_rows: dict[tuple, tuple | None] = {}
+
+    # =========================================================================
+    # Transactions
+    # =========================================================================
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """
+        Group several repository writes into a single commit.
+
+        Inside the block, write methods leave the transaction open; it is
+        committed once on exit (one fsync instead of N) or rolled back if
+        the block raises. Blocks may nest - only the outermost one commits.
+
+        The block is scoped to the task that opened it: writes from other
+        tasks (a UI action during a sync, say) wait until it is committed
+        or rolled back, rather than landing in it.
+
+        Usage:
+            >>> async with repo.transaction():
+            ...     for folder in folders:
+            ...         await repo.save_folder(folder)
+        """
+        task = asyncio.current_task()
+        if self._transaction_owner is task:
+            # Nested block: the outermost one commits or rolls back
+            yield
+            return
+
+        async with self._write_lock:
+            self._transaction_owner = task
+            try:
+                yield
+            except BaseException:
+                await self.db.conn.rollback()
+                # Cached rows may have been read from the rolled-back writes
+                self._account_rows.clear()
+                self._folder_rows.clear()
+                raise
+            else:
+                await self.db.conn.commit()
+            finally:
+                self._transaction_owner = None
+
+    async def _fetch_cached(
+        self,
+        cache: dict[tuple, tuple | None],
+        key: tuple,
+        sql: str,
+        params: tuple,
+    ) -> tuple | None:
+        """
+        Fetch one row, serving repeated lookups from the given cache.
+
+        Args:
+            cache: _account_rows or _folder_rows.
+            key: Lookup key, unique within the cache.
+            sql: Query returning at most one row.
+            params: Query parameters.
+
+        Returns:
+            The row, or None if there is none.
+        """
+        try:
+            return cache[key]
+        except KeyError:
+            pass
+        async with self.db.conn.execute(sql, params) as cursor:
+            row = await cursor.fetchone()
+        cache[key] = row
+        return row
+
     # =========================================================================
     # Account Operations
     # =========================================================================
@@ -75,11 +246,11 @@ class Repository:
         Returns:
             Account if found, None otherwise.
         """
-        async with self.db.conn.execute(
+        row = await self._fetch_cached(
+            self._account_rows, ("id", account_id),
             "SELECT * FROM accounts WHERE id = ?", (account_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            return self._row_to_account(row) if row else None
+        )
+        return self._row_to_account(row) if row else None
 
     async def get_account_by_name(self, name: str) -> Account | None:
         """
@@ -91,12 +262,13 @@ class Repository:
         Returns:
             Account if found, None otherwise.
         """
-        async with self.db.conn.execute(
+        row = await self._fetch_cached(
+            self._account_rows, ("name", name),
             "SELECT * FROM accounts WHERE name = ?", (name,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            return self._row_to_account(row) if row else None
+        )
+        return self._row_to_account(row) if row else None
 
+    @_writes
     async def save_account(self, account: Account) -> Account:
         """
         Save an account (insert or update).
@@ -119,6 +291,8 @@ class Repository:
                  account.smtp_host, account.smtp_port, account.smtp_security,
                  account.enabled)
             )
+            # lastrowid is a plain attribute of the finished cursor (no extra
+            # round trip), so INSERT ... RETURNING id would gain nothing here
             account.id = cursor.lastrowid
         else:
             # Update existing account
@@ -132,9 +306,10 @@ class Repository:
                  account.smtp_host, account.smtp_port, account.smtp_security,
                  account.enabled, account.id)
             )
-        await self.db.conn.commit()
+        self._account_rows.clear()
         return account
 
+    @_writes
     async def delete_account(self, account_id: int) -> None:
         """
         Delete an account and all its data.
@@ -146,7 +321,8 @@ class Repository:
         await self.db.conn.execute(
             "DELETE FROM accounts WHERE id = ?", (account_id,)
         )
-        await self.db.conn.commit()
+        self._account_rows.clear()
+        self._folder_rows.clear()
 
     def _row_to_account(self, row) -> Account:
         """Convert a database row to an Account object."""
@@ -195,12 +371,13 @@ class Repository:
         Returns:
             Folder if found, None otherwise.
         """
-        async with self.db.conn.execute(
+        row = await self._fetch_cached(
+            self._folder_rows, ("id", folder_id),
             "SELECT * FROM folders WHERE id = ?", (folder_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            return self._row_to_folder(row) if row else None
+        )
+        return self._row_to_folder(row) if row else None
 
+    @_writes
     async def save_folder(self, folder: Folder) -> Folder:
         """
         Save a folder (insert or update).
@@ -215,26 +392,27 @@ class Repository:
             cursor = await self.db.conn.execute(
                 """INSERT INTO folders
                    (account_id, name, folder_type, uidvalidity, delimiter,
-                    total_messages, unread_count, last_sync)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                    total_messages, unread_count, last_sync, highest_modseq)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
                 (folder.account_id, folder.name, folder.folder_type.name.lower(),
                  folder.uidvalidity, folder.delimiter, folder.total_messages,
                  folder.unread_count,
-                 folder.last_sync.isoformat() if folder.last_sync else None)
+                 folder.last_sync.isoformat() if folder.last_sync else None,
+                 folder.highest_modseq)
             )
             folder.id = cursor.lastrowid
         else:
             await self.db.conn.execute(
                 """UPDATE folders SET
                    name=?, folder_type=?, uidvalidity=?, delimiter=?,
-                   total_messages=?, unread_count=?, last_sync=?
+                   total_messages=?, unread_count=?, last_sync=?, highest_modseq=?
                    WHERE id=?""",
                 (folder.name, folder.folder_type.name.lower(), folder.uidvalidity,
                  folder.delimiter, folder.total_messages, folder.unread_count,
                  folder.last_sync.isoformat() if folder.last_sync else None,
-                 folder.id)
+                 folder.highest_modseq, folder.id)
             )
-        await self.db.conn.commit()
+        self._folder_rows.clear()
         return folder
 
     async def get_folder_by_name(
@@ -252,13 +430,14 @@ class Repository:
         Returns:
             Folder if found, None otherwise.
         """
-        async with self.db.conn.execute(
+        row = await self._fetch_cached(
+            self._folder_rows, ("name", account_id, folder_name),
             "SELECT * FROM folders WHERE account_id = ? AND name = ?",
             (account_id, folder_name)
-        ) as cursor:
-            row = await cursor.fetchone()
-            return self._row_to_folder(row) if row else None
+        )
+        return self._row_to_folder(row) if row else None
 
+    @_writes
     async def delete_folder(self, folder_id: int) -> None:
         """
         Delete a folder and all its messages.
@@ -270,7 +449,7 @@ class Repository:
         await self.db.conn.execute(
             "DELETE FROM folders WHERE id = ?", (folder_id,)
         )
-        await self.db.conn.commit()
+        self._folder_rows.clear()
 
     async def get_folder_by_type(
         self,
@@ -287,13 +466,14 @@ class Repository:
         Returns:
             Folder if found, None otherwise.
         """
-        async with self.db.conn.execute(
+        row = await self._fetch_cached(
+            self._folder_rows, ("type", account_id, folder_type),
             "SELECT * FROM folders WHERE account_id = ? AND folder_type = ?",
             (account_id, folder_type.name.lower())
-        ) as cursor:
-            row = await cursor.fetchone()
-            return self._row_to_folder(row) if row else None
+        )
+        return self._row_to_folder(row) if row else None
 
+    @_writes
     async def delete_message(self, message_id: int) -> None:
         """
         Delete a single message by ID.
@@ -304,8 +484,8 @@ class Repository:
         await self.db.conn.execute(
             "DELETE FROM messages WHERE id = ?", (message_id,)
         )
-        await self.db.conn.commit()
 
+    @_writes
     async def update_message_folder(self, message_id: int, folder_id: int) -> None:
         """
         Move a message to a different folder in the local database.
@@ -318,7 +498,6 @@ class Repository:
             "UPDATE messages SET folder_id = ? WHERE id = ?",
             (folder_id, message_id),
         )
-        await self.db.conn.commit()
 
     def _row_to_folder(self, row) -> Folder:
         """Convert a database row to a Folder object."""
@@ -332,6 +511,7 @@ class Repository:
             total_messages=row[6] or 0,
             unread_count=row[7] or 0,
             last_sync=datetime.fromisoformat(row[8]) if row[8] else None,
+            highest_modseq=row[9],
         )
 
     # =========================================================================
@@ -358,22 +538,27 @@ class Repository:
         Returns:
             List of Message objects (without body, for efficiency).
         """
-        query = "SELECT * FROM messages WHERE folder_id = ?"
         params: list = [folder_id]
 
         if unread_only:
-            # Check if SEEN flag is NOT set
-            query += " AND (flags & ?) = 0"
-            params.append(MessageFlags.SEEN)
+            # Check if SEEN flag is NOT set, through the partial unread
+            # index (see get_unread_count)
+            query = (
+                f"SELECT {_MESSAGE_COLUMNS_LITE}"
+                " FROM messages INDEXED BY idx_messages_unread"
+                f" WHERE folder_id = ? AND (flags & {int(MessageFlags.SEEN)}) = 0"
+            )
+        else:
+            query = f"SELECT {_MESSAGE_COLUMNS_LITE} FROM messages WHERE folder_id = ?"
 
-        # Sort by date_sent, handling mixed timezone formats
-        # datetime() normalizes ISO strings for proper sorting
-        query += " ORDER BY datetime(date_sent) DESC LIMIT ? OFFSET ?"
+        # date_sent is stored in UTC (see _sent_isoformat), so the raw text
+        # sorts chronologically and the date indexes can serve the ORDER BY
+        query += " ORDER BY date_sent DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
 
         async with self.db.conn.execute(query, params) as cursor:
             rows = await cursor.fetchall()
-            return [self._row_to_message(row) for row in rows]
+            return [self._row_to_message_lite(row) for row in rows]
 
     async def get_message(self, message_id: int) -> Message | None:
         """
@@ -386,7 +571,7 @@ class Repository:
             Message with body if found, None otherwise.
         """
         async with self.db.conn.execute(
-            "SELECT * FROM messages WHERE id = ?", (message_id,)
+            f"SELECT {_MESSAGE_COLUMNS} FROM messages WHERE id = ?", (message_id,)
         ) as cursor:
             row = await cursor.fetchone()
             if not row:
@@ -399,6 +584,7 @@ class Repository:
 
             return message
 
+    @_writes
     async def save_message(self, message: Message) -> Message:
         """
         Save a message (insert or update).
@@ -417,15 +603,7 @@ class Repository:
                     date_sent, date_received, flags, spam_score,
                     body_text, body_html, raw_headers)
                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (message.folder_id, message.uid, message.message_id,
-                 message.in_reply_to, json.dumps(message.references),
-                 message.subject, message.sender, message.sender_name,
-                 json.dumps(message.recipients), json.dumps(message.cc),
-                 json.dumps(message.bcc),
-                 message.date_sent.isoformat() if message.date_sent else None,
-                 message.date_received.isoformat() if message.date_received else None,
-                 int(message.flags), message.spam_score,
-                 message.body_text, message.body_html, message.raw_headers)
+                self._message_values(message)
             )
             message.id = cursor.lastrowid
         else:
@@ -436,18 +614,8 @@ class Repository:
                    date_sent=?, date_received=?, flags=?, spam_score=?,
                    body_text=?, body_html=?, raw_headers=?
                    WHERE id=?""",
-                (message.folder_id, message.uid, message.message_id,
-                 message.in_reply_to, json.dumps(message.references),
-                 message.subject, message.sender, message.sender_name,
-                 json.dumps(message.recipients), json.dumps(message.cc),
-                 json.dumps(message.bcc),
-                 message.date_sent.isoformat() if message.date_sent else None,
-                 message.date_received.isoformat() if message.date_received else None,
-                 int(message.flags), message.spam_score,
-                 message.body_text, message.body_html, message.raw_headers,
-                 message.id)
+                (*self._message_values(message), message.id)
             )
-        await self.db.conn.commit()
 
         # Save attachments if present
         if message.attachments and message.id:
@@ -455,6 +623,7 @@ class Repository:
 
         return message
 
+    @_writes
     async def update_message_flags(
         self,
         message_id: int,
@@ -471,7 +640,6 @@ class Repository:
             "UPDATE messages SET flags = ? WHERE id = ?",
             (int(flags), message_id)
         )
-        await self.db.conn.commit()
 
     async def search_messages(
         self,
@@ -491,11 +659,11 @@ class Repository:
             limit: Maximum results to return.
 
         Returns:
-            List of matching messages.
+            List of matching messages (without body, like get_messages()).
         """
         # Build the FTS query
-        sql = """
-            SELECT m.* FROM messages m
+        sql = f"""
+            SELECT {_MESSAGE_COLUMNS_LITE_QUALIFIED} FROM messages m
             JOIN messages_fts fts ON m.id = fts.rowid
             WHERE messages_fts MATCH ?
         """
@@ -513,7 +681,7 @@ class Repository:
 
         async with self.db.conn.execute(sql, params) as cursor:
             rows = await cursor.fetchall()
-            return [self._row_to_message(row) for row in rows]
+            return [self._row_to_message_lite(row) for row in rows]
 
     async def _get_attachments(self, message_id: int) -> list[Attachment]:
         """Load attachments for a message."""
@@ -524,6 +692,7 @@ class Repository:
             rows = await cursor.fetchall()
             return [self._row_to_attachment(row) for row in rows]
 
+    @_writes
     async def _save_attachments(
         self,
         message_id: int,
@@ -540,39 +709,89 @@ class Repository:
         )
 
         # Insert new attachments
-        for att in attachments:
-            await self.db.conn.execute(
-                """INSERT INTO attachments
-                   (message_id, filename, content_type, size, content_id, is_inline, data)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+        await self.db.conn.executemany(
+            """INSERT INTO attachments
+               (message_id, filename, content_type, size, content_id, is_inline, data)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            [
                 (message_id, att.filename, att.content_type, att.size,
                  att.content_id, 1 if att.is_inline else 0, att.data)
-            )
+                for att in attachments
+            ]
+        )
+
+    def _message_values(self, message: Message) -> tuple:
+        """
+        Get a message's column values for INSERT/UPDATE.
 
-        await self.db.conn.commit()
+        Order: folder_id through raw_headers, as in _MESSAGE_COLUMNS
+        without the leading id.
+        """
+        return (
+            message.folder_id, message.uid, message.message_id,
+            message.in_reply_to, _dumps(message.references),
+            message.subject, message.sender, message.sender_name,
+            _dumps(message.recipients), _dumps(message.cc),
+            _dumps(message.bcc),
+            _sent_isoformat(message.date_sent),
+            message.date_received.isoformat() if message.date_received else None,
+            int(message.flags), message.spam_score,
+            message.body_text, message.body_html, message.raw_headers,
+        )
 
     def _row_to_message(self, row) -> Message:
         """Convert a database row to a Message object."""
+        # Unpack once instead of indexing the row 19 times
+        (id_, folder_id, uid, message_id, in_reply_to, references, subject,
+         sender, sender_name, recipients, cc, bcc, date_sent, date_received,
+         flags, spam_score, body_text, body_html, raw_headers) = row
         return Message(
-            id=row[0],
-            folder_id=row[1],
-            uid=row[2],
-            message_id=row[3] or "",
-            in_reply_to=row[4] or "",
-            references=json.loads(row[5]) if row[5] else [],
-            subject=row[6] or "",
-            sender=row[7] or "",
-            sender_name=row[8] or "",
-            recipients=json.loads(row[9]) if row[9] else [],
-            cc=json.loads(row[10]) if row[10] else [],
-            bcc=json.loads(row[11]) if row[11] else [],
-            date_sent=datetime.fromisoformat(row[12]) if row[12] else None,
-            date_received=datetime.fromisoformat(row[13]) if row[13] else None,
-            flags=MessageFlags(row[14]),
-            spam_score=row[15] or 0.0,
-            body_text=row[16] or "",
-            body_html=row[17] or "",
-            raw_headers=row[18] or "",
+            id=id_,
+            folder_id=folder_id,
+            uid=uid,
+            message_id=message_id or "",
+            in_reply_to=in_reply_to or "",
+            references=_loads(references) if references else [],
+            subject=subject or "",
+            sender=sender or "",
+            sender_name=sender_name or "",
+            recipients=_loads(recipients) if recipients else [],
+            cc=_loads(cc) if cc else [],
+            bcc=_loads(bcc) if bcc else [],
+            date_sent=datetime.fromisoformat(date_sent) if date_sent else None,
+            date_received=(
+                datetime.fromisoformat(date_received) if date_received else None
+            ),
+            flags=_message_flags(flags),
+            spam_score=spam_score or 0.0,
+            body_text=body_text or "",
+            body_html=body_html or "",
+            raw_headers=raw_headers or "",
+        )
+
+    def _row_to_message_lite(self, row) -> Message:
+        """
+        Convert a _MESSAGE_COLUMNS_LITE row to a Message.
+
+        Bodies, raw headers and address/reference lists are left empty.
+        """
+        (id_, folder_id, uid, message_id, in_reply_to, subject, sender,
+         sender_name, date_sent, date_received, flags, spam_score) = row
+        return Message(
+            id=id_,
+            folder_id=folder_id,
+            uid=uid,
+            message_id=message_id or "",
+            in_reply_to=in_reply_to or "",
+            subject=subject or "",
+            sender=sender or "",
+            sender_name=sender_name or "",
+            date_sent=datetime.fromisoformat(date_sent) if date_sent else None,
+            date_received=(
+                datetime.fromisoformat(date_received) if date_received else None
+            ),
+            flags=_message_flags(flags),
+            spam_score=spam_score or 0.0,
         )
 
     def _row_to_attachment(self, row) -> Attachment:
@@ -610,7 +829,7 @@ class Repository:
             Message if found, None otherwise.
         """
         async with self.db.conn.execute(
-            "SELECT * FROM messages WHERE folder_id = ? AND uid = ?",
+            f"SELECT {_MESSAGE_COLUMNS} FROM messages WHERE folder_id = ? AND uid = ?",
             (folder_id, uid)
         ) as cursor:
             row = await cursor.fetchone()
@@ -654,11 +873,31 @@ class Repository:
             rows = await cursor.fetchall()
             return {row[0] for row in rows}
 
+    async def get_local_uids_sorted(self, folder_id: int) -> "array[int]":
+        """
+        Get all UIDs we have locally for a folder, in ascending order.
+
+        Returns a compact array (8 bytes per UID instead of a boxed int in
+        a hash set) suitable for merge-style diffs against server UIDs.
+
+        Args:
+            folder_id: Folder ID.
+
+        Returns:
+            array('q') of UIDs sorted ascending.
+        """
+        async with self.db.conn.execute(
+            "SELECT uid FROM messages WHERE folder_id = ? ORDER BY uid",
+            (folder_id,)
+        ) as cursor:
+            rows = await cursor.fetchall()
+            return array("q", [row[0] for row in rows])
+
     async def get_local_flags(self, folder_id: int) -> dict[int, MessageFlags]:
         """
         Get UID -> flags mapping for a folder.
 
-        Used for flag synchronization.
+        Used for flag synchronization. Keys are in ascending UID order.
 
         Args:
             folder_id: Folder ID.
@@ -667,16 +906,17 @@ class Repository:
             Dictionary mapping UID to MessageFlags.
         """
         async with self.db.conn.execute(
-            "SELECT uid, flags FROM messages WHERE folder_id = ?",
+            "SELECT uid, flags FROM messages WHERE folder_id = ? ORDER BY uid",
             (folder_id,)
         ) as cursor:
             rows = await cursor.fetchall()
-            return {row[0]: MessageFlags(row[1]) for row in rows}
+            return {uid: _message_flags(flags) for uid, flags in rows}
 
+    @_writes
     async def delete_messages_by_uids(
         self,
         folder_id: int,
-        uids: set[int],
+        uids: set[int] | list[int],
     ) -> int:
         """
         Delete messages by their UIDs.
@@ -685,7 +925,7 @@ class Repository:
 
         Args:
             folder_id: Folder ID.
-            uids: Set of UIDs to delete.
+            uids: UIDs to delete.
 
         Returns:
             Number of messages deleted.
@@ -693,15 +933,21 @@ class Repository:
         if not uids:
             return 0
 
-        # Build placeholders for IN clause
-        placeholders = ",".join("?" * len(uids))
-        cursor = await self.db.conn.execute(
-            f"DELETE FROM messages WHERE folder_id = ? AND uid IN ({placeholders})",
-            [folder_id, *uids]
-        )
-        await self.db.conn.commit()
-        return cursor.rowcount
+        # Delete in chunks that stay under SQLite's bound-parameter limit;
+        # @_writes commits them all at once
+        uids = list(uids)
+        deleted = 0
+        for start in range(0, len(uids), _MAX_SQL_VARIABLES):
+            chunk = uids[start:start + _MAX_SQL_VARIABLES]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = await self.db.conn.execute(
+                f"DELETE FROM messages WHERE folder_id = ? AND uid IN ({placeholders})",
+                [folder_id, *chunk]
+            )
+            deleted += cursor.rowcount
+        return deleted
 
+    @_writes
     async def delete_all_messages_in_folder(self, folder_id: int) -> int:
         """
         Delete all messages in a folder.
@@ -718,9 +964,9 @@ class Repository:
             "DELETE FROM messages WHERE folder_id = ?",
             (folder_id,)
         )
-        await self.db.conn.commit()
         return cursor.rowcount
 
+    @_writes
     async def save_messages_bulk(
         self,
         messages: list[Message],
@@ -739,20 +985,10 @@ class Repository:
         if not messages:
             return []
 
-        # Prepare all values
-        values = []
-        for msg in messages:
-            values.append((
-                msg.folder_id, msg.uid, msg.message_id,
-                msg.in_reply_to, json.dumps(msg.references),
-                msg.subject, msg.sender, msg.sender_name,
-                json.dumps(msg.recipients), json.dumps(msg.cc),
-                json.dumps(msg.bcc),
-                msg.date_sent.isoformat() if msg.date_sent else None,
-                msg.date_received.isoformat() if msg.date_received else None,
-                int(msg.flags), msg.spam_score,
-                msg.body_text, msg.body_html, msg.raw_headers
-            ))
+        # Prepare all values. Encoding is ~3 us per message against ~75 us
+        # for the INSERT with its FTS indexing, so the lists stay one JSON
+        # value per column rather than a fused per-row encoding.
+        values = [self._message_values(msg) for msg in messages]
 
         # Bulk insert with INSERT OR REPLACE to handle duplicates
         await self.db.conn.executemany(
@@ -764,24 +1000,49 @@ class Repository:
                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
             values
         )
-        await self.db.conn.commit()
 
-        # Save attachments for messages that have them
-        # We need to look up message IDs since executemany doesn't return them
+        # Save attachments for messages that have them. executemany()
+        # doesn't return row ids, so look them up with one IN query per
+        # folder (a batch normally holds a single folder). INSERT OR REPLACE
+        # re-creates replaced rows, and the FK cascade has already removed
+        # their old attachments.
+        by_folder: dict[int, dict[int, Message]] = {}
         for msg in messages:
             if msg.attachments:
-                # Get the message ID by folder_id and UID
+                by_folder.setdefault(msg.folder_id, {})[msg.uid] = msg
+
+        attachment_rows = []
+        for folder_id, by_uid in by_folder.items():
+            uids = list(by_uid)
+            for start in range(0, len(uids), _MAX_SQL_VARIABLES):
+                chunk = uids[start:start + _MAX_SQL_VARIABLES]
+                placeholders = ",".join("?" * len(chunk))
                 async with self.db.conn.execute(
-                    "SELECT id FROM messages WHERE folder_id = ? AND uid = ?",
-                    (msg.folder_id, msg.uid)
+                    f"SELECT id, uid FROM messages"
+                    f" WHERE folder_id = ? AND uid IN ({placeholders})",
+                    [folder_id, *chunk]
                 ) as cursor:
-                    row = await cursor.fetchone()
-                    if row:
-                        msg.id = row[0]
-                        await self._save_attachments(msg.id, msg.attachments)
+                    rows = await cursor.fetchall()
+                for message_id, uid in rows:
+                    msg = by_uid[uid]
+                    msg.id = message_id
+                    attachment_rows.extend(
+                        (message_id, att.filename, att.content_type, att.size,
+                         att.content_id, 1 if att.is_inline else 0, att.data)
+                        for att in msg.attachments
+                    )
+
+        if attachment_rows:
+            await self.db.conn.executemany(
+                """INSERT INTO attachments
+                   (message_id, filename, content_type, size, content_id, is_inline, data)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                attachment_rows
+            )
 
         return messages
 
+    @_writes
     async def update_flags_bulk(
         self,
         folder_id: int,
@@ -804,7 +1065,6 @@ class Repository:
             "UPDATE messages SET flags = ? WHERE folder_id = ? AND uid = ?",
             updates
         )
-        await self.db.conn.commit()
 
     async def get_message_count(self, folder_id: int) -> int:
         """
@@ -833,9 +1093,79 @@ class Repository:
         Returns:
             Unread message count.
         """
+        # Counted from the partial idx_messages_unread, which holds only
+        # unread rows, instead of reading every message in the folder. SEEN
+        # must be inlined as a literal to match the index's WHERE clause, and
+        # the index is named because without ANALYZE statistics the planner
+        # picks UNIQUE(folder_id, uid) instead.
         async with self.db.conn.execute(
-            "SELECT COUNT(*) FROM messages WHERE folder_id = ? AND (flags & ?) = 0",
-            (folder_id, int(MessageFlags.SEEN))
+            "SELECT COUNT(*) FROM messages INDEXED BY idx_messages_unread"
+            f" WHERE folder_id = ? AND (flags & {int(MessageFlags.SEEN)}) = 0",
+            (folder_id,)
         ) as cursor:
             row = await cursor.fetchone()
             return row[0] if row else 0
+
+    # =========================================================================
+    # Spam Model Operations
+    # =========================================================================
+
+    async def load_spam_model(
+        self,
+    ) -> tuple[int, int, float | None, list[tuple[str, int, int]]] | None:
+        """
+        Load the spam classifier's training counts.
+
+        Returns:
+            Tuple of (spam message count, ham message count, smoothing
+            alpha or None if not stored, list of (token, spam count, ham
+            count) rows), or None if no model has been saved.
+        """
+        async with self.db.conn.execute(
+            "SELECT key, value FROM spam_meta"
+        ) as cursor:
+            meta = dict(cast(list[tuple[str, Any]], await cursor.fetchall()))
+        if "spam_count" not in meta or "ham_count" not in meta:
+            return None
+
+        async with self.db.conn.execute(
+            "SELECT token, spam_count, ham_count FROM spam_tokens"
+        ) as cursor:
+            # Rows unpack like tuples, so they are returned without copying
+            rows = cast(list[tuple[str, int, int]], await cursor.fetchall())
+
+        return meta["spam_count"], meta["ham_count"], meta.get("alpha"), rows
+
+    @_writes
+    async def save_spam_model(
+        self,
+        spam_count: int,
+        ham_count: int,
+        tokens: Iterable[tuple[str, int, int]],
+        *,
+        alpha: float,
+        replace: bool = False,
+    ) -> None:
+        """
+        Save spam classifier training counts in a single commit.
+
+        Args:
+            spam_count: Number of spam messages trained on.
+            ham_count: Number of ham messages trained on.
+            tokens: (token, spam count, ham count) rows to upsert.
+            alpha: Smoothing parameter the model is used with.
+            replace: Delete all stored tokens first (full save) instead of
+                     updating only the given rows.
+        """
+        conn = self.db.conn
+        if replace:
+            await conn.execute("DELETE FROM spam_tokens")
+        await conn.executemany(
+            "INSERT OR REPLACE INTO spam_tokens (token, spam_count, ham_count) "
+            "VALUES (?, ?, ?)",
+            tokens
+        )
+        await conn.executemany(
+            "INSERT OR REPLACE INTO spam_meta (key, value) VALUES (?, ?)",
+            [("spam_count", spam_count), ("ham_count", ham_count), ("alpha", alpha)]
+        )
@@ -27,7 +27,7 @@ from hawk_tui.core import Account, Folder, Message
 from hawk_tui.storage.database import Database
 from hawk_tui.storage.repository import Repository
 from hawk_tui.imap.client import IMAPClient, IMAPAuthenticationError
-from hawk_tui.imap.sync import SyncManager, SyncStatus
+from hawk_tui.imap.sync import SyncManager, SyncStatus, refresh_spam_classifier
 from hawk_tui.imap.idle import IdleWorker, IdleEvent
 from hawk_tui.config import Config
 from hawk_tui.ui.screens.password import PasswordScreen
@@ -148,9 +148,8 @@ class MainScreen(Screen):
         self._search_active = False
         self._search_query = ""
 
-        # Initialize spam classifier for training
+        # Initialize spam classifier for training (model loaded on mount)
         self._spam_classifier = SpamClassifier()
-        self._spam_classifier.load()
         self._spam_config = self._load_spam_config()
 
         # IDLE worker for push notifications
@@ -227,6 +226,11 @@ class MainScreen(Screen):
         await self._db.connect()
         self._repo = Repository(self._db)
 
+        # Load the spam model, importing a model file saved by older versions
+        if not await self._spam_classifier.load_from_db(self._repo):
+            if self._spam_classifier.load():
+                await self._spam_classifier.save_to_db(self._repo)
+
         # Sync accounts from config to database
         self.update_status("Syncing accounts...")
         await self._sync_config_accounts()
@@ -282,12 +286,16 @@ class MainScreen(Screen):
             self.notify(f"Error syncing accounts: {e}", severity="error")
 
     async def on_unmount(self) -> None:
-        """Clean up database connection and IDLE worker."""
+        """Clean up database connection, IDLE worker and shared browser."""
         # Stop IDLE worker
         if self._idle_worker:
             await self._idle_worker.stop()
             self._idle_worker = None
 
+        # Stop the headless browser if an email was rendered with it
+        from hawk_tui.rendering.browser import shutdown_browser_renderer
+        await shutdown_browser_renderer()
+
         # Close database
         if self._db:
             await self._db.close()
@@ -851,6 +859,14 @@ class MainScreen(Screen):
         except Exception as e:
             self.notify(f"Delete failed: {e}", severity="error")
 
+    async def _save_spam_model(self) -> None:
+        """Persist spam training and make the next sync reload the model."""
+        if self._repo:
+            await self._spam_classifier.save_to_db(self._repo)
+        else:
+            self._spam_classifier.save()
+        refresh_spam_classifier()
+
     async def action_mark_junk(self) -> None:
         """Mark selected message(s) as junk, train classifier, and move to Junk folder."""
         message_list = self.query_one("#message-list", MessageList)
@@ -873,7 +889,7 @@ class MainScreen(Screen):
                     self._spam_classifier.train(full_message, is_spam=True)
                     trained_count += 1
             if trained_count > 0:
-                self._spam_classifier.save()
+                await self._save_spam_model()
 
         # Mark as spam locally and update database
         for message in messages:
@@ -979,7 +995,7 @@ class MainScreen(Screen):
                 self._spam_classifier.train(full_message, is_spam=False)
                 trained_count += 1
             if trained_count > 0:
-                self._spam_classifier.save()
+                await self._save_spam_model()
 
         # Mark as not spam locally and update database
         for message in messages:
@@ -1150,7 +1166,7 @@ class MainScreen(Screen):
         """Background worker to empty a folder."""
         try:
             if self._repo and self._current_account:
-                local_uids = await self._repo.get_local_uids(folder_id)
+                local_uids = await self._repo.get_local_uids_sorted(folder_id)
 
                 if local_uids:
                     # Delete from server in batches
@@ -1393,7 +1409,7 @@ class MainScreen(Screen):
 
         try:
             # Import renderers
-            from hawk_tui.rendering.browser import BrowserRenderer, BrowserRenderOptions
+            from hawk_tui.rendering.browser import BrowserRenderOptions, get_browser_renderer
             from hawk_tui.rendering.images import ImageRenderer
             import os
 
@@ -1406,9 +1422,11 @@ class MainScreen(Screen):
                 viewport_width=pixel_width,
                 viewport_height=800,
                 dark_mode=True,
+                # Full fidelity view: load remotely hosted images too
+                block_images=False,
             )
-            async with BrowserRenderer(options) as renderer:
-                screenshot = await renderer.render(message.body_html)
+            renderer = await get_browser_renderer()
+            screenshot = await renderer.render(message.body_html, options)
 
             # Convert to Kitty escape sequence
             img_renderer = ImageRenderer()
@@ -1420,9 +1438,9 @@ class MainScreen(Screen):
                 import termios
                 import tty
 
-                # Clear screen and show image
-                print("\033[2J\033[H", end="")
-                print(kitty_data, end="")
+                # Clear screen and show image (escape sequence is raw bytes)
+                print("\033[2J\033[H", end="", flush=True)
+                sys.stdout.buffer.write(kitty_data)
                 sys.stdout.flush()
 
                 # Show instructions
@@ -1493,7 +1511,7 @@ class MainScreen(Screen):
         import os
 
         try:
-            from hawk_tui.rendering.browser import BrowserRenderer
+            from hawk_tui.rendering.browser import get_browser_renderer
             from hawk_tui.rendering.images import ImageRenderer
 
             # Clear screen
@@ -1513,18 +1531,20 @@ class MainScreen(Screen):
                 viewport_width=pixel_width,
                 viewport_height=800,  # Initial height, will expand for content
                 dark_mode=True,
+                # Full fidelity view: load remotely hosted images too
+                block_images=False,
             )
-            async with BrowserRenderer(options) as renderer:
-                screenshot = await renderer.render(html)
+            renderer = await get_browser_renderer()
+            screenshot = await renderer.render(html, options)
 
             # Display via Kitty at native size (no scaling down)
             # This gives readable text - user can scroll in terminal if needed
             img_renderer = ImageRenderer()
             kitty_data = img_renderer.render_kitty_from_png(screenshot)
 
-            # Clear screen and display
-            print("\033[2J\033[H", end="")
-            print(kitty_data, end="")
+            # Clear screen and display (escape sequence is raw bytes)
+            print("\033[2J\033[H", end="", flush=True)
+            sys.stdout.buffer.write(kitty_data)
             sys.stdout.flush()
 
             # Wait for keypress
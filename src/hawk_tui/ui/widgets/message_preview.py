@@ -91,6 +91,11 @@ class MessagePreview(ScrollableContainer):
                 return ""
             return text.replace("[", "\\[").replace("]", "\\]")
 
+        # Dates are stored in UTC; show them in local time, like the list
+        date_sent = message.date_sent
+        if date_sent is not None and date_sent.tzinfo is not None:
+            date_sent = date_sent.astimezone()
+
         # Build header display (escape user content to prevent markup injection)
         header_lines = [
             f"[bold]From:[/] {escape(message.display_sender)} <{escape(message.sender)}>",
@@ -100,7 +105,7 @@ class MessagePreview(ScrollableContainer):
             header_lines.append(f"[bold]CC:[/] {escape(', '.join(message.cc))}")
         header_lines.extend([
             f"[bold]Subject:[/] {escape(message.subject)}",
-            f"[bold]Date:[/] {message.date_sent}",
+            f"[bold]Date:[/] {date_sent}",
             "─" * 50,
         ])
         header = "\n".join(header_lines)
@@ -18,6 +18,18 @@ def temp_dir():
         yield Path(tmpdir)
 
 
+@pytest.fixture
+async def repository(temp_dir):
+    """Create a Repository on a fresh database in a temporary directory."""
+    from hawk_tui.storage.database import Database
+    from hawk_tui.storage.repository import Repository
+
+    db = Database(temp_dir / "hawk.db")
+    await db.connect()
+    yield Repository(db)
+    await db.close()
+
+
 @pytest.fixture
 def sample_account():
     """Create a sample Account for testing."""
@@ -104,6 +116,43 @@ def sample_html_email():
     """
 
 
+@pytest.fixture
+def simple_html_documents():
+    """
+    Text-only HTML documents (html/body/p/br/pre and entities only).
+
+    Hand-picked edge cases plus a deterministic set of generated ones,
+    for checking the fast text path against inscriptis.
+    """
+    import random
+
+    documents = [
+        "<html><body><p>Hello,</p><p>Just text.</p></body></html>",
+        "Line one<br>Line two<br/>Line three",
+        "<p>Spaces   and\ttabs\n collapse</p><p>&amp; entities &lt;stay&gt;</p>",
+        "<pre>  keep\n    indentation\r\n</pre>after",
+        "<html><body>&amp;<p>\u200b\t<br>\r\na b</html>",
+        "<p>\u2060&nbsp;</p>b",
+        "x<br> \u200b <br>y<p>\ufeff</p>z",
+        "<p>unclosed final paragraph",
+    ]
+
+    # Random mixes of tags, whitespace, zero-width characters and entities
+    atoms = [
+        "a", "b", "x y", " ", "\t", "\n", "\r\n", "\u200b", "\u2060", "\ufeff",
+        "&amp;", "&nbsp;", "<p>", "</p>", "<br>", "<br/>", "<pre>", "</pre>",
+    ]
+    rng = random.Random(20240115)
+    for _ in range(3000):
+        body = "".join(rng.choice(atoms) for _ in range(rng.randint(1, 10)))
+        documents.append(
+            rng.choice(["", "<html>", "<html><body>"])
+            + body
+            + rng.choice(["", "</html>", "</body></html>"])
+        )
+    return documents
+
+
 @pytest.fixture
 def sample_spam_message():
     """Create a sample spam message for classifier testing."""
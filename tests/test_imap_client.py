@@ -0,0 +1,62 @@
+# =============================================================================
+# IMAP Client Tests
+# =============================================================================
+# Parsing of server responses as aioimaplib hands them over, with the IMAP
+# connection replaced by a fake that returns canned responses.
+# =============================================================================
+
+from aioimaplib import Response
+
+from hawk_tui.imap.client import IMAPClient
+
+
+class _FakeIMAP:
+    """Stands in for the aioimaplib connection, answering UID SEARCH."""
+
+    def __init__(self, response):
+        self.response = response
+        self.criteria = None
+
+    async def uid_search(self, criteria, charset=None):
+        self.criteria = criteria
+        return self.response
+
+
+def _client(response, exists=10):
+    client = IMAPClient.__new__(IMAPClient)
+    client._client = _FakeIMAP(response)
+
+    async def ensure_connected():
+        pass
+
+    async def select_folder(folder_name, readonly=False):
+        return {"EXISTS": exists}
+
+    client.ensure_connected = ensure_connected
+    client.select_folder = select_folder
+    return client
+
+
+async def test_search_uids_parses_untagged_lines():
+    """UIDs come from the untagged lines, which lack the SEARCH keyword."""
+    client = _client(Response("OK", [b"7 2 3 1", b"SEARCH completed"]))
+    assert await client.search_uids("INBOX") == [1, 2, 3, 7]
+    assert client._client.criteria == "ALL"
+
+
+async def test_search_uids_accepts_search_keyword():
+    """Lines that still carry the SEARCH keyword parse the same way."""
+    client = _client(Response("OK", [b"SEARCH 4 5", b"6", b"SEARCH completed (0.001 secs)"]))
+    assert await client.search_uids("INBOX") == [4, 5, 6]
+
+
+async def test_search_uids_no_matches():
+    """A response with only the status line yields no UIDs."""
+    client = _client(Response("OK", [b"SEARCH completed"]))
+    assert await client.search_uids("INBOX") == []
+
+
+async def test_search_uids_failed_search():
+    """A failed search yields no UIDs rather than parsing the error text."""
+    client = _client(Response("NO", [b"1 2 3"]))
+    assert await client.search_uids("INBOX") == []
@@ -0,0 +1,116 @@
+# =============================================================================
+# HTML Pre-cleaning Tests
+# =============================================================================
+# _strip_blocks() replaced a pipeline of regular expressions with a
+# str.find() scanner; these pin it to that pipeline's output, and its
+# streaming and bytes variants to the one-shot str version.
+# =============================================================================
+
+import random
+import re
+
+import pytest
+
+from hawk_tui.rendering.text import (
+    TextRenderer,
+    _strip_blocks,
+    _strip_blocks_stream,
+    _strip_office_ns,
+)
+
+# The pre-cleaning regexes, in the order they used to be applied
+_REGEX_PIPELINE = [
+    (r'<!--\[if[^\]]*\]>.*?<!\[endif\]-->', re.DOTALL | re.IGNORECASE),
+    (r'<!--\[if[^\]]*\]><!-->.*?<!--<!\[endif\]-->', re.DOTALL | re.IGNORECASE),
+    (r'<!\[if[^\]]*\]>.*?<!\[endif\]>', re.DOTALL | re.IGNORECASE),
+    (r'<!--\[if gte mso.*?<!\[endif\]-->', re.DOTALL | re.IGNORECASE),
+    (r'<style[^>]*>.*?</style>', re.DOTALL | re.IGNORECASE),
+    (r'<script[^>]*>.*?</script>', re.DOTALL | re.IGNORECASE),
+    (r'<\?xml[^>]*\?>', re.IGNORECASE),
+    (r'<o:[^>]*>.*?</o:[^>]*>', re.DOTALL),
+    (r'<v:[^>]*>.*?</v:[^>]*>', re.DOTALL),
+]
+
+
+def _regex_preclean(html: str) -> str:
+    """Pre-clean HTML the way the regex pipeline did."""
+    for pattern, flags in _REGEX_PIPELINE:
+        html = re.sub(pattern, '', html, flags=flags)
+    return html
+
+
+# Representative Outlook / marketing email markup
+DOCUMENTS = [
+    # Outlook newsletter head
+    '<?xml version="1.0" encoding="utf-8"?>\n'
+    '<html xmlns:o="urn:schemas-microsoft-com:office:office"><head>'
+    '<!--[if gte mso 9]><xml><o:OfficeDocumentSettings><o:AllowPNG/>'
+    '</o:OfficeDocumentSettings></xml><![endif]-->'
+    '<style type="text/css">body { margin: 0; } p { color: #333; }</style>'
+    '</head><body><p class=MsoNormal>Hello<o:p></o:p></p></body></html>',
+    # Downlevel-revealed and bare conditionals
+    '<p>before</p><!--[if !mso]><!--><div>not outlook</div><!--<![endif]-->'
+    '<p>between</p><![if !vml]><img src="cid:logo"><![endif]><p>after</p>',
+    # VML button with a fallback
+    '<div><!--[if mso]><v:roundrect href="https://example.com" style="width:200px">'
+    '<v:textbox>Click</v:textbox></v:roundrect><![endif]-->'
+    '<a href="https://example.com">Click</a></div>',
+    # Mixed case tags, several blocks, a script
+    '<HTML><HEAD><STYLE>A { }</STYLE><Style media="screen">.x{}</sTyLe></HEAD>'
+    '<BODY>text<SCRIPT type="text/javascript">alert(1)</SCRIPT>more</BODY></HTML>',
+    # Unterminated blocks are kept
+    '<p>kept</p><style>no end',
+    '<p>a</p><!--[if mso]>never closed<p>b</p>',
+    '<p>a</p><script>var x = 1;<p>b</p>',
+    # Malformed openers are left alone
+    '<p>a</p><!--[if mso <p>b</p><![endif]--><p>c</p>',
+    '<?xml version="1.0"><p>not a declaration</p>',
+    # Non-ASCII text (some characters grow when lowercased)
+    '<p>İstanbul Ångström K</p><STYLE>p{}</STYLE><p>été</p>',
+    # Nothing to strip
+    '<html><body><p>Just a <b>plain</b> email.</p></body></html>',
+    '',
+]
+
+
+@pytest.fixture(params=range(len(DOCUMENTS)))
+def document(request):
+    """Each representative document in turn."""
+    return DOCUMENTS[request.param]
+
+
+def test_preclean_matches_regex_pipeline(document):
+    """_strip_blocks() plus _strip_office_ns() equal the old regexes."""
+    assert _strip_office_ns(_strip_blocks(document)) == _regex_preclean(document)
+
+
+def test_preclean_matches_regex_pipeline_on_sample_email(sample_html_email):
+    """The sample newsletter pre-cleans the same way."""
+    renderer = TextRenderer()
+    assert renderer._preclean_html(sample_html_email) == _regex_preclean(sample_html_email)
+
+
+def test_bytes_match_str(document):
+    """str and (undecoded) bytes input give the same output."""
+    expected = _strip_blocks(document).encode()
+    assert _strip_blocks(document.encode()) == expected
+
+
+def test_stream_matches_one_shot(document):
+    """Any split into chunks gives the same output as the whole text."""
+    expected = _strip_blocks(document)
+    rng = random.Random(len(document))
+
+    # Every single split point, then random multi-way splits
+    for cut in range(len(document) + 1):
+        chunks = [document[:cut], document[cut:]]
+        assert ''.join(_strip_blocks_stream(chunks)) == expected, cut
+    for _ in range(200):
+        cuts = sorted(rng.sample(range(len(document) + 1), min(5, len(document) + 1)))
+        chunks = [document[a:b] for a, b in zip([0, *cuts], [*cuts, len(document)], strict=True)]
+        assert ''.join(_strip_blocks_stream(chunks)) == expected, cuts
+
+
+def test_stream_single_characters(document):
+    """One character per chunk (every boundary at once) still matches."""
+    assert ''.join(_strip_blocks_stream(list(document))) == _strip_blocks(document)
@@ -0,0 +1,175 @@
+# =============================================================================
+# Spam Model Persistence Tests
+# =============================================================================
+# Training data is saved to the spam_meta/spam_tokens tables, incrementally
+# after the first save, and imported from the model files older versions
+# wrote. A mistake on any of these paths loses the user's training.
+# =============================================================================
+
+import json
+from dataclasses import replace
+
+from hawk_tui.spam import SpamClassifier
+from hawk_tui.storage.database import Database
+from hawk_tui.storage.repository import Repository
+
+
+def _model_state(classifier):
+    """Everything a saved model should reproduce, as plain values."""
+    counts = classifier._counts
+    return (
+        classifier._spam_count,
+        classifier._ham_count,
+        classifier._alpha,
+        {
+            token: (counts[offset], counts[offset + 1])
+            for token, offset in classifier._token_index.items()
+        },
+    )
+
+
+def _trained(sample_message, sample_spam_message):
+    """A classifier trained on the sample messages and a few variants."""
+    classifier = SpamClassifier(alpha=0.5)
+    classifier.train(sample_spam_message, is_spam=True)
+    classifier.train(
+        replace(sample_spam_message, subject="FREE MONEY claim your prize now"),
+        is_spam=True,
+    )
+    classifier.train(sample_message, is_spam=False)
+    classifier.train(
+        replace(sample_message, subject="Lunch tomorrow?", body_text="See you at noon."),
+        is_spam=False,
+    )
+    return classifier
+
+
+async def test_full_save_round_trip(repository, sample_message, sample_spam_message):
+    """A first save_to_db() stores the whole model and loads back equal."""
+    classifier = _trained(sample_message, sample_spam_message)
+    await classifier.save_to_db(repository)
+
+    loaded = SpamClassifier()
+    assert await loaded.load_from_db(repository)
+    assert _model_state(loaded) == _model_state(classifier)
+    assert loaded.classify(sample_spam_message) == classifier.classify(sample_spam_message)
+    assert loaded.classify(sample_message) == classifier.classify(sample_message)
+
+
+async def test_incremental_save_after_untrain(
+    repository, sample_message, sample_spam_message
+):
+    """Saves after untrain()/train() write only changed tokens, correctly."""
+    classifier = _trained(sample_message, sample_spam_message)
+    await classifier.save_to_db(repository)
+
+    # Reclassify a spam message as ham, then learn a new message
+    classifier.untrain(sample_spam_message, was_spam=True)
+    classifier.train(sample_spam_message, is_spam=False)
+    await classifier.save_to_db(repository)
+    classifier.train(
+        replace(sample_message, subject="Quarterly report", body_text="Attached."),
+        is_spam=False,
+    )
+    await classifier.save_to_db(repository)
+
+    loaded = SpamClassifier()
+    assert await loaded.load_from_db(repository)
+    assert _model_state(loaded) == _model_state(classifier)
+
+
+async def test_incremental_save_after_load(
+    repository, sample_message, sample_spam_message
+):
+    """A model loaded from the database saves incrementally on top of it."""
+    await _trained(sample_message, sample_spam_message).save_to_db(repository)
+
+    classifier = SpamClassifier()
+    assert await classifier.load_from_db(repository)
+    classifier.untrain(sample_message, was_spam=False)
+    await classifier.save_to_db(repository)
+
+    loaded = SpamClassifier()
+    assert await loaded.load_from_db(repository)
+    assert _model_state(loaded) == _model_state(classifier)
+
+
+async def test_reload_from_reopened_database(
+    temp_dir, sample_message, sample_spam_message
+):
+    """Saved training survives closing and reopening the database."""
+    classifier = _trained(sample_message, sample_spam_message)
+
+    db = Database(temp_dir / "model.db")
+    await db.connect()
+    await classifier.save_to_db(Repository(db))
+    await db.close()
+
+    db = Database(temp_dir / "model.db")
+    await db.connect()
+    try:
+        loaded = SpamClassifier()
+        assert await loaded.load_from_db(Repository(db))
+        assert _model_state(loaded) == _model_state(classifier)
+    finally:
+        await db.close()
+
+
+async def test_no_saved_model(repository):
+    """load_from_db() reports a database without a model."""
+    assert not await SpamClassifier().load_from_db(repository)
+
+
+def test_binary_file_round_trip(temp_dir, sample_message, sample_spam_message):
+    """save() and load() of the binary model file."""
+    classifier = _trained(sample_message, sample_spam_message)
+    classifier.save(temp_dir / "spam_model.bin")
+
+    loaded = SpamClassifier()
+    assert loaded.load(temp_dir / "spam_model.bin")
+    assert _model_state(loaded) == _model_state(classifier)
+
+
+async def test_legacy_json_import(
+    repository, temp_dir, sample_message, sample_spam_message
+):
+    """A legacy .json model next to the .bin path is imported into the database."""
+    classifier = _trained(sample_message, sample_spam_message)
+    spam_count, ham_count, _, token_counts = _model_state(classifier)
+    legacy = {
+        "spam_count": spam_count,
+        "ham_count": ham_count,
+        "tokens": {
+            token: {"spam": spam, "ham": ham}
+            for token, (spam, ham) in token_counts.items()
+        },
+    }
+    (temp_dir / "spam_model.json").write_text(json.dumps(legacy))
+
+    # What MainScreen.on_mount does on the first start after upgrading
+    imported = SpamClassifier(model_path=temp_dir / "spam_model.bin", alpha=0.5)
+    assert not await imported.load_from_db(repository)
+    assert imported.load()
+    await imported.save_to_db(repository)
+
+    loaded = SpamClassifier()
+    assert await loaded.load_from_db(repository)
+    assert _model_state(loaded) == _model_state(classifier)
+
+
+def test_corrupt_json_leaves_model_untouched(
+    temp_dir, sample_message, sample_spam_message
+):
+    """A legacy model that fails to parse doesn't half-load."""
+    classifier = _trained(sample_message, sample_spam_message)
+    before = _model_state(classifier)
+
+    path = temp_dir / "spam_model.json"
+    path.write_text(json.dumps({
+        "spam_count": 99,
+        "ham_count": 99,
+        "tokens": {"free": {"spam": 3}},
+    }))
+
+    assert not classifier.load(path)
+    assert _model_state(classifier) == before
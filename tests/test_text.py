@@ -0,0 +1,42 @@
+# =============================================================================
+# Text Renderer Tests
+# =============================================================================
+# The fast paths in hawk_tui.rendering.text must give exactly what the
+# general code (inscriptis, the regex pre-cleaning) would.
+# =============================================================================
+
+from inscriptis import get_text
+
+from hawk_tui.rendering.text import TextRenderer, _render_simple_html
+
+
+def test_simple_html_matches_inscriptis(simple_html_documents):
+    """_render_simple_html() output matches inscriptis after cleanup."""
+    renderer = TextRenderer()
+    checked = 0
+    for html in simple_html_documents:
+        fast = _render_simple_html(html)
+        if fast is None:
+            # Malformed structure, left to inscriptis
+            continue
+        expected = renderer._clean_output(get_text(html, renderer._config))
+        assert renderer._clean_output(fast) == expected, repr(html)
+        checked += 1
+
+    # Most of the corpus should take the fast path
+    assert checked > len(simple_html_documents) // 4
+
+
+def test_simple_html_declines_other_markup(sample_message, sample_html_email):
+    """Documents with other tags are left to inscriptis."""
+    assert _render_simple_html(sample_message.body_html) is None
+    assert _render_simple_html(sample_html_email) is None
+
+
+def test_render_matches_inscriptis_for_simple_html(simple_html_documents):
+    """render() gives the same text with or without the fast path."""
+    renderer = TextRenderer()
+    for html in simple_html_documents[:200]:
+        expected = renderer._clean_output(get_text(html, renderer._config))
+        expected = expected.replace('[', r'\[')
+        assert renderer.render(html) == expected, repr(html)